@@ -1,15 +1,31 @@
 from pathlib import Path
 import json
 from datetime import datetime
-import math
+import itertools
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import joblib
 
-from preprocessing import add_hour_feature, impute_numerical, fill_categorical, add_missing_indicators, encode_categoricals
-from feature_engineering import add_amount_features
-from scaling import scale_numeric
+from batching import MicroBatcher
+from eda_profile import UploadSketch, profile_upload
+from explanations import (
+    contribution_matrix,
+    explain_rows,
+    native_contributions,
+    resolve_positions,
+    supports_native_contributions,
+)
+from feature_pipeline import FeaturePipeline
+from jobs import JobManager
+from model_registry import ModelRegistry
+from parallel_scoring import ParallelScorer
+from prediction_store import PredictionStore, compact_raw_columns
+from stacking import CachedScorer, ProbaCache, StackedEnsemble
+from tree_compiler import compile_model
 
 BASE_DIR = Path(__file__).resolve().parent
 RESULTS_DIR = BASE_DIR / "results"
@@ -39,47 +55,228 @@ def handle_exception(exc):
     response.status_code = 500
     return response
 
-ARTIFACTS_CACHE = None
-METRICS_CACHE = None
+MAX_SCORE_BATCH = 1000
+PREDICT_STREAM_CHUNKSIZE = int(os.environ.get("PREDICT_STREAM_CHUNKSIZE", "50000"))
+EDA_CHUNKSIZE = int(os.environ.get("EDA_CHUNKSIZE", "100000"))
+EDA_APPROXIMATE_MIN_MB = float(os.environ.get("EDA_APPROXIMATE_MIN_MB", "0"))
+STREAM_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+MAX_JOB_PAGE = 10000
+PARALLEL_SCORING_WORKERS = int(os.environ.get("PARALLEL_SCORING_WORKERS", "0"))
+PARALLEL_SCORING_MIN_ROWS = int(os.environ.get("PARALLEL_SCORING_MIN_ROWS", "50000"))
+SCORE_BATCHING = os.environ.get("SCORE_BATCHING", "0") == "1"
+SCORE_BATCH_MAX_WAIT_MS = float(os.environ.get("SCORE_BATCH_MAX_WAIT_MS", "2"))
+SCORE_BATCH_MAX_ROWS = int(os.environ.get("SCORE_BATCH_MAX_ROWS", "256"))
+EXPLAIN_METHOD = os.environ.get("EXPLAIN_METHOD", "heuristic")
+EXPLAIN_SHAP_MAX_ROWS = int(os.environ.get("EXPLAIN_SHAP_MAX_ROWS", "5000"))
+EXPLAIN_SHAP_BUDGET_MS = float(os.environ.get("EXPLAIN_SHAP_BUDGET_MS", "500"))
+EXPLAIN_SHAP_FIRST_CHUNK_ROWS = 16
+
+WARMUP_ROWS = 8
+WARM_MODELS = [key for key in os.environ.get("WARM_MODELS", "").split(",") if key]
+ARTIFACT_MMAP = os.environ.get("ARTIFACT_MMAP", "0") == "1"
+COMPILED_SCORING = os.environ.get("COMPILED_SCORING", "0") == "1"
+PROBA_CACHE_ENTRIES = int(os.environ.get("PROBA_CACHE_ENTRIES", "8"))
+PROBA_CACHE_MIN_ROWS = int(os.environ.get("PROBA_CACHE_MIN_ROWS", "1000"))
+MODEL_RELOAD_SECONDS = float(os.environ.get("MODEL_RELOAD_SECONDS", "5"))
+
+REGISTRY = None
+SCORERS_LOCK = threading.RLock()
 EDA_CACHE = None
-LAST_PREDICTIONS = {}
+CACHE_LOCK = threading.Lock()
+READY = threading.Event()
+PREDICTIONS = PredictionStore(
+    max_entries=int(os.environ.get("PREDICTION_STORE_MAX_ENTRIES", "32")),
+    ttl_seconds=float(os.environ.get("PREDICTION_STORE_TTL_SECONDS", "1800")),
+    max_bytes=int(float(os.environ.get("PREDICTION_STORE_MAX_MB", "512")) * 1024 * 1024),
+    spill_dir=os.environ.get("PREDICTION_STORE_DIR") or None,
+)
+BATCHERS = {}
+BATCHERS_LOCK = threading.Lock()
+PARALLEL_SCORER = None
+PARALLEL_SCORER_LOCK = threading.Lock()
+JOBS = JobManager(
+    max_workers=int(os.environ.get("JOB_WORKERS", "1")),
+    max_pending=int(os.environ.get("JOB_MAX_PENDING", "8")),
+    ttl_seconds=float(os.environ.get("JOB_TTL_SECONDS", "3600")),
+    work_dir=os.environ.get("JOB_DIR") or None,
+)
+
+
+def get_registry():
+    global REGISTRY
+    if REGISTRY is None:
+        with CACHE_LOCK:
+            if REGISTRY is None:
+                REGISTRY = ModelRegistry(
+                    RESULTS_DIR, warm_fn=warm_bundle, poll_seconds=MODEL_RELOAD_SECONDS, mmap=ARTIFACT_MMAP
+                )
+    return REGISTRY
+
+
+def active_bundle():
+    registry = get_registry()
+    bundle = registry.get()
+    registry.start_watcher()
+    return bundle
 
 
 def load_artifacts():
-    global ARTIFACTS_CACHE
-    if ARTIFACTS_CACHE is None:
-        path = RESULTS_DIR / "artifacts.joblib"
-        if not path.exists():
-            raise FileNotFoundError("Missing artifacts.joblib. Run run_pipeline.py to generate artifacts.")
-        ARTIFACTS_CACHE = joblib.load(path)
-    return ARTIFACTS_CACHE
+    return active_bundle()["artifacts"]
+
+
+def build_scorer(bundle, model_key):
+    models = bundle["artifacts"].get("models", {})
+    model = models.get(model_key)
+    if model is None:
+        return None
+    cache = bundle["proba_cache"]
+    if isinstance(model, StackedEnsemble) or hasattr(model, "final_estimator_"):
+        ensemble = model if isinstance(model, StackedEnsemble) else StackedEnsemble.from_stacking_classifier(model)
+        base_models = {}
+        for name, base in ensemble.base_models.items():
+            if base is models.get(name):
+                base_models[name] = scoring_model(bundle, name)
+            else:
+                base = compile_model(base) if COMPILED_SCORING else base
+                base_models[name] = CachedScorer(base, f"{model_key}.{name}", cache)
+        return ensemble.with_base_models(base_models, cache)
+    return CachedScorer(compile_model(model) if COMPILED_SCORING else model, model_key, cache)
+
+
+def scoring_model(bundle, model_key):
+    scorers = bundle.get("scorers")
+    if scorers is None or model_key not in scorers:
+        with SCORERS_LOCK:
+            bundle.setdefault("proba_cache", ProbaCache(PROBA_CACHE_ENTRIES, PROBA_CACHE_MIN_ROWS))
+            scorers = bundle.setdefault("scorers", {})
+            if model_key not in scorers:
+                scorers[model_key] = build_scorer(bundle, model_key)
+    return scorers[model_key]
 
 
 def load_metrics():
-    global METRICS_CACHE
-    if METRICS_CACHE is None:
-        path = RESULTS_DIR / "metrics.json"
-        if not path.exists():
-            raise FileNotFoundError("Missing metrics.json. Run run_pipeline.py to generate metrics.")
-        METRICS_CACHE = json.loads(path.read_text())
-    return METRICS_CACHE
+    metrics_data = active_bundle()["metrics"]
+    if metrics_data is None:
+        raise FileNotFoundError("Missing metrics.json. Run run_pipeline.py to generate metrics.")
+    return metrics_data
 
 
 def load_training_eda():
     global EDA_CACHE
-    if EDA_CACHE is None:
-        path = RESULTS_DIR / "eda_training.json"
-        if not path.exists():
-            raise FileNotFoundError("Missing eda_training.json. Run eda.py to generate EDA data.")
-        EDA_CACHE = json.loads(path.read_text())
-    return EDA_CACHE
+    path = RESULTS_DIR / "eda_training.json"
+    if not path.exists():
+        raise FileNotFoundError("Missing eda_training.json. Run eda.py to generate EDA data.")
+    stamp = path.stat().st_mtime_ns
+    cached = EDA_CACHE
+    if cached is None or cached[0] != stamp:
+        with CACHE_LOCK:
+            if EDA_CACHE is None or EDA_CACHE[0] != stamp:
+                EDA_CACHE = (stamp, json.loads(path.read_text()))
+            cached = EDA_CACHE
+    return cached[1]
+
+
+def warm_bundle(bundle):
+    artifacts = bundle["artifacts"]
+    pipeline = get_feature_pipeline(artifacts)
+    X = pipeline.transform_frame(pd.DataFrame({"TransactionID": np.arange(WARMUP_ROWS)}))
+    pipeline.transform_records([{"TransactionID": 0}])
+    for model_key in WARM_MODELS or list(artifacts.get("models", {})):
+        start = time.perf_counter()
+        model = scoring_model(bundle, model_key)
+        if model is None:
+            continue
+        model.predict_proba(X)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Warm-up [{bundle['version']}]: {model_key} loaded and scored {WARMUP_ROWS} rows in {elapsed_ms:.1f} ms")
+
+
+def preload():
+    artifacts = get_registry().get(warm=False)["artifacts"]
+    get_feature_pipeline(artifacts)
+    models = artifacts.get("models", {})
+    for model_key in WARM_MODELS or list(models):
+        models.get(model_key)
+    try:
+        load_training_eda()
+    except FileNotFoundError as exc:
+        print(f"Warm-up: {exc}")
+
+
+def warm_up():
+    preload()
+    get_registry().get()
+    READY.set()
+
+
+def get_batcher(model_key, model):
+    if not SCORE_BATCHING:
+        return None
+    with BATCHERS_LOCK:
+        entry = BATCHERS.get(model_key)
+        if entry is None or entry[0] is not model:
+            if entry is not None:
+                entry[1].close()
+            batcher = MicroBatcher(
+                lambda X: model.predict_proba(X)[:, 1],
+                max_wait_ms=SCORE_BATCH_MAX_WAIT_MS,
+                max_rows=SCORE_BATCH_MAX_ROWS,
+            )
+            entry = (model, batcher)
+            BATCHERS[model_key] = entry
+        return entry[1]
+
+
+def shap_contributions(prediction, positions):
+    bundle = active_bundle()
+    if prediction.get("version") != bundle["version"]:
+        return None
+    model = bundle["artifacts"].get("models", {}).get(prediction["model"])
+    if model is None or not supports_native_contributions(model):
+        return None
+    features = prediction["features"]
+    cache = prediction.get("shap") or {
+        "values": np.zeros(features.shape, dtype=np.float32),
+        "computed": np.zeros(len(features), dtype=bool),
+    }
+    missing = np.unique(positions[~cache["computed"][positions]])
+    if len(missing) > EXPLAIN_SHAP_MAX_ROWS:
+        return None
+    if len(missing):
+        cache = {"values": cache["values"].copy(), "computed": cache["computed"].copy()}
+        deadline = time.perf_counter() + EXPLAIN_SHAP_BUDGET_MS / 1000
+        start, chunk_rows = 0, EXPLAIN_SHAP_FIRST_CHUNK_ROWS
+        while start < len(missing):
+            chunk = missing[start:start + chunk_rows]
+            chunk_start = time.perf_counter()
+            cache["values"][chunk] = native_contributions(model, features[chunk], prediction["feature_columns"])
+            cache["computed"][chunk] = True
+            start += len(chunk)
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            row_seconds = (time.perf_counter() - chunk_start) / len(chunk)
+            chunk_rows = max(1, int(remaining / row_seconds))
+        PREDICTIONS.update(prediction["prediction_id"], "shap", cache)
+        if not cache["computed"][positions].all():
+            return None
+    return cache["values"][positions].astype(np.float64)
 
 
-def read_upload_files(require_transaction=True):
-    merged = request.files.get("file_merged")
-    transaction = request.files.get("file_transaction")
-    identity = request.files.get("file_identity")
+def get_parallel_scorer(bundle):
+    global PARALLEL_SCORER
+    if PARALLEL_SCORING_WORKERS <= 0:
+        return None
+    with PARALLEL_SCORER_LOCK:
+        if PARALLEL_SCORER is None or PARALLEL_SCORER[0] is not bundle:
+            previous = PARALLEL_SCORER
+            PARALLEL_SCORER = (bundle, ParallelScorer(bundle["artifacts_path"], workers=PARALLEL_SCORING_WORKERS))
+            if previous is not None:
+                previous[1].close(wait=False)
+        return PARALLEL_SCORER[1]
 
+
+def upload_meta(files):
     def file_meta(file_obj, field):
         if file_obj is None:
             return None
@@ -91,17 +288,33 @@ def read_upload_files(require_transaction=True):
             size = None
         return {"field": field, "filename": file_obj.filename, "size_bytes": size}
 
-    meta = {
+    merged = files.get("file_merged")
+    transaction = files.get("file_transaction")
+    identity = files.get("file_identity")
+    if merged or (transaction is not None and identity is not None):
+        dataset_type = "merged"
+    elif transaction is not None:
+        dataset_type = "transaction"
+    else:
+        dataset_type = "identity" if identity is not None else None
+    return {
         "files": list(filter(None, [
             file_meta(merged, "file_merged"),
             file_meta(transaction, "file_transaction"),
             file_meta(identity, "file_identity"),
         ])),
-        "dataset_type": None,
+        "dataset_type": dataset_type,
     }
 
+
+def read_upload_files(require_transaction=True, files=None):
+    files = request.files if files is None else files
+    merged = files.get("file_merged")
+    transaction = files.get("file_transaction")
+    identity = files.get("file_identity")
+    meta = upload_meta(files)
+
     if merged:
-        meta["dataset_type"] = "merged"
         return pd.read_csv(merged), meta
 
     if transaction is None and identity is None:
@@ -111,50 +324,132 @@ def read_upload_files(require_transaction=True):
     df_identity = pd.read_csv(identity) if identity is not None else None
 
     if df_transaction is not None and df_identity is not None:
-        meta["dataset_type"] = "merged"
         return df_transaction.merge(df_identity, on="TransactionID", how="left"), meta
     if df_transaction is not None:
-        meta["dataset_type"] = "transaction"
         return df_transaction, meta
     if df_identity is not None and not require_transaction:
-        meta["dataset_type"] = "identity"
         return df_identity, meta
 
     raise ValueError("Provide file_transaction (transaction data required for prediction).")
 
 
-def select_columns_for_inference(df):
-    columns_to_keep = [
-        "TransactionID", "TransactionDT", "TransactionAmt", "ProductCD",
-        "card1", "card2", "card3", "card4", "card5", "card6",
-        "addr1", "addr2", "P_emaildomain", "R_emaildomain",
-        "DeviceType", "DeviceInfo",
-    ] + [col for col in df.columns if "id_" in col]
-    present = [col for col in columns_to_keep if col in df.columns]
-    return df[present]
+def inference_input_columns(pipeline):
+    columns = {"TransactionID", "TransactionDT", "TransactionAmt", "card1", "DeviceInfo"}
+    for col in pipeline.feature_columns:
+        columns.add(col[: -len("_missing")] if col.endswith("_missing") else col)
+    return columns
+
+
+def iter_upload_chunks(chunksize, usecols=None, files=None, require_transaction=True):
+    files = request.files if files is None else files
+    merged = files.get("file_merged")
+    transaction = files.get("file_transaction")
+    identity = files.get("file_identity")
+    read_options = {"usecols": (lambda col: col in usecols) if usecols is not None else None}
+
+    if merged:
+        return pd.read_csv(merged.stream, chunksize=chunksize, **read_options)
+    if transaction is None:
+        if identity is not None and not require_transaction:
+            return pd.read_csv(identity.stream, chunksize=chunksize, **read_options)
+        raise ValueError("Provide file_transaction (transaction data required for prediction).")
+
+    chunks = pd.read_csv(transaction.stream, chunksize=chunksize, **read_options)
+    if identity is None:
+        return chunks
+    df_identity = pd.read_csv(identity.stream, **read_options)
+    return (chunk.merge(df_identity, on="TransactionID", how="left") for chunk in chunks)
+
+
+def prediction_summary(total, fraud_count, threshold, model_key):
+    return {
+        "total": int(total),
+        "fraud_count": int(fraud_count),
+        "non_fraud_count": int(total - fraud_count),
+        "fraud_rate": float(fraud_count / total) if total else 0.0,
+        "threshold": threshold,
+        "model": model_key,
+    }
+
+
+def score_upload_chunks(chunks, pipeline, model, threshold):
+    offset = 0
+    for chunk in chunks:
+        proba = model.predict_proba(pipeline.transform_frame(chunk))[:, 1]
+        yield pd.DataFrame({
+            "row_id": np.arange(offset, offset + len(chunk)).astype(str),
+            "TransactionID": (
+                chunk["TransactionID"].astype(str).to_numpy() if "TransactionID" in chunk.columns else None
+            ),
+            "proba": proba.astype(np.float64),
+            "pred_label": (proba > threshold).astype(int),
+        })
+        offset += len(chunk)
+
+
+def stream_predictions(model_key, model, threshold, artifacts, stream_format):
+    pipeline = get_feature_pipeline(artifacts)
+    chunks = iter(iter_upload_chunks(PREDICT_STREAM_CHUNKSIZE, inference_input_columns(pipeline)))
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("Uploaded file has no rows.")
+
+    def generate():
+        total = fraud_count = 0
+        for out in score_upload_chunks(itertools.chain([first], chunks), pipeline, model, threshold):
+            if stream_format == "csv":
+                yield out.to_csv(index=False, header=total == 0)
+            else:
+                yield out.to_json(orient="records", lines=True, double_precision=15)
+            total += len(out)
+            fraud_count += int(out["pred_label"].sum())
+        if stream_format != "csv":
+            yield json.dumps({"summary": prediction_summary(total, fraud_count, threshold, model_key)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=STREAM_MIMETYPES[stream_format])
+
+
+def run_predict_job(job, files, model_key, threshold):
+    bundle = active_bundle()
+    artifacts = bundle["artifacts"]
+    model = scoring_model(bundle, model_key)
+    if model is None:
+        raise ValueError(f"Model not available: {model_key}")
+    pipeline = get_feature_pipeline(artifacts)
+    source = (files.get("file_merged") or files.get("file_transaction")).stream
+    source_size = os.fstat(source.fileno()).st_size or 1
+    chunks = iter_upload_chunks(PREDICT_STREAM_CHUNKSIZE, inference_input_columns(pipeline), files)
+
+    total = fraud_count = 0
+    for out in score_upload_chunks(chunks, pipeline, model, threshold):
+        job.add_part(out)
+        total += len(out)
+        fraud_count += int(out["pred_label"].sum())
+        job.report(progress=source.tell() / source_size, **prediction_summary(total, fraud_count, threshold, model_key))
+    return None
+
+
+def run_eda_job(job, files, approximate=False):
+    if approximate or use_approximate_eda(files):
+        return compute_upload_eda_sketch(files, load_artifacts(), job.report)
+    df, meta = read_upload_files(require_transaction=False, files=files)
+    job.report(progress=0.5, rows=int(df.shape[0]), columns=int(df.shape[1]))
+    return compute_upload_eda(df, meta, load_artifacts())
+
+
+def get_feature_pipeline(artifacts):
+    pipeline = artifacts.get("feature_pipeline")
+    if pipeline is None:
+        pipeline = FeaturePipeline.from_artifacts(artifacts)
+        artifacts["feature_pipeline"] = pipeline
+    return pipeline
 
 
 def preprocess_for_inference(df, artifacts):
-    df = df.copy()
-    df = select_columns_for_inference(df)
-    df = add_hour_feature(df)
-
-    df, _, _ = impute_numerical(df, artifacts.get("medians"))
-    df, cat_cols = fill_categorical(df)
-    df = add_missing_indicators(df)
-    df, _ = encode_categoricals(df, cat_cols, artifacts.get("encoders"))
-
-    df = add_amount_features(df)
-    feature_columns = artifacts.get("feature_columns", [])
-    for col in feature_columns:
-        if col not in df.columns:
-            df[col] = 0
-    df, _ = scale_numeric(df, artifacts.get("scaler"), feature_columns=feature_columns)
-    df = df[feature_columns]
-    return df
-
-
-def build_schema_alignment(upload_df, artifacts):
+    return get_feature_pipeline(artifacts).transform_frame(df)
+
+
+def build_schema_alignment(upload_df, artifacts, unseen=None):
     required = set(artifacts.get("feature_columns", []))
     present = set(upload_df.columns)
     missing_required = sorted(list(required - present))
@@ -175,14 +470,9 @@ def build_schema_alignment(upload_df, artifacts):
     used_raw = set(base_columns)
     ignored_columns = sorted(list(present - used_raw))
 
-    unseen_categories = {}
-    encoders = artifacts.get("encoders", {})
-    for col, classes in encoders.items():
-        if col in upload_df.columns:
-            values = upload_df[col].astype(str).unique().tolist()
-            unseen = [v for v in values if v not in classes]
-            if unseen:
-                unseen_categories[col] = len(unseen)
+    if unseen is None:
+        unseen = get_feature_pipeline(artifacts).unseen_categories(upload_df)
+    unseen_categories = {col: len(values) for col, values in unseen.items() if values}
 
     return {
         "present_required": present_required,
@@ -199,6 +489,13 @@ def health():
     return jsonify({"status": "ok"})
 
 
+@app.route("/api/v1/ready", methods=["GET"])
+def ready():
+    if not READY.is_set():
+        return jsonify({"status": "warming"}), 503
+    return jsonify({"status": "ready"})
+
+
 @app.route("/api/v1/models", methods=["GET"])
 def models():
     trained_at = None
@@ -230,8 +527,16 @@ def models():
                 "supports_threshold": True,
                 "supports_explain": True,
             },
-        ]
+        ],
+        "active_version": None,
+        "loaded_at": None,
     }
+    try:
+        bundle = active_bundle()
+        payload["active_version"] = bundle["version"]
+        payload["loaded_at"] = bundle["loaded_at"]
+    except FileNotFoundError:
+        pass
     return jsonify(payload)
 
 
@@ -254,11 +559,22 @@ def predict():
     model_key = request.form.get("model", "xgb")
     threshold = float(request.form.get("threshold", 0.5))
 
-    artifacts = load_artifacts()
-    models = artifacts.get("models", {})
-    model = models.get(model_key)
+    bundle = active_bundle()
+    artifacts = bundle["artifacts"]
+    model = scoring_model(bundle, model_key)
     if model is None:
         return jsonify({"error": f"Model not available: {model_key}"}), 404
+    if model_key != "stack":
+        threshold = 0.5
+
+    stream_format = request.form.get("stream")
+    if stream_format:
+        if stream_format not in STREAM_MIMETYPES:
+            return jsonify({"error": f"Unknown stream format: {stream_format}"}), 400
+        try:
+            return stream_predictions(model_key, model, threshold, artifacts, stream_format)
+        except Exception as exc:
+            return jsonify({"error": str(exc)}), 400
 
     try:
         df, _ = read_upload_files(require_transaction=True)
@@ -266,11 +582,13 @@ def predict():
         return jsonify({"error": str(exc)}), 400
 
     transaction_ids = df["TransactionID"].astype(str).tolist() if "TransactionID" in df.columns else None
-    X = preprocess_for_inference(df, artifacts)
-    proba = model.predict_proba(X)[:, 1]
-
-    if model_key != "stack":
-        threshold = 0.5
+    scorer = get_parallel_scorer(bundle) if len(df) >= PARALLEL_SCORING_MIN_ROWS else None
+    if scorer is not None:
+        features, proba = scorer.score(model_key, df)
+        X = pd.DataFrame(features, columns=get_feature_pipeline(artifacts).feature_columns, copy=False)
+    else:
+        X = preprocess_for_inference(df, artifacts)
+        proba = model.predict_proba(X)[:, 1]
     preds = (proba > threshold).astype(int)
 
     rows = []
@@ -282,24 +600,65 @@ def predict():
             "pred_label": int(preds[idx]),
         })
 
-    summary = {
-        "total": int(len(rows)),
-        "fraud_count": int(preds.sum()),
-        "non_fraud_count": int((preds == 0).sum()),
-        "fraud_rate": float(preds.mean()) if len(preds) else 0.0,
-        "threshold": threshold,
-        "model": model_key,
-    }
+    summary = prediction_summary(len(rows), preds.sum(), threshold, model_key)
 
-    LAST_PREDICTIONS.clear()
-    LAST_PREDICTIONS.update({
-        "rows": rows,
-        "features": X,
+    prediction_id = PREDICTIONS.put({
+        "features": X.to_numpy(),
+        "feature_columns": list(X.columns),
+        "proba": proba.astype(np.float32),
+        "pred_label": preds.astype(np.int8),
         "model": model_key,
-        "raw": df,
+        "version": bundle["version"],
+        "raw": compact_raw_columns(df),
     })
 
-    return jsonify({"summary": summary, "rows": rows})
+    return jsonify({"prediction_id": prediction_id, "summary": summary, "rows": rows})
+
+
+@app.route("/api/v1/score", methods=["POST"])
+def score():
+    data = request.get_json(silent=True) or {}
+    model_key = data.get("model", "xgb")
+    threshold = float(data.get("threshold", 0.5)) if model_key == "stack" else 0.5
+    transactions = data.get("transactions")
+    if transactions is None and isinstance(data.get("transaction"), dict):
+        transactions = [data["transaction"]]
+    if not transactions or not all(isinstance(t, dict) for t in transactions):
+        return jsonify({"error": "Provide transaction (object) or transactions (list of objects)."}), 400
+    if len(transactions) > MAX_SCORE_BATCH:
+        return jsonify({"error": f"At most {MAX_SCORE_BATCH} transactions per call; use /predict for files."}), 400
+
+    bundle = active_bundle()
+    artifacts = bundle["artifacts"]
+    model = scoring_model(bundle, model_key)
+    if model is None:
+        return jsonify({"error": f"Model not available: {model_key}"}), 404
+
+    X = get_feature_pipeline(artifacts).transform_records(transactions)
+    batcher = get_batcher(model_key, model)
+    proba = batcher.predict(X) if batcher is not None else model.predict_proba(X)[:, 1]
+
+    results = [
+        {
+            "TransactionID": transaction.get("TransactionID"),
+            "proba": float(p),
+            "pred_label": int(p > threshold),
+        }
+        for transaction, p in zip(transactions, proba)
+    ]
+    return jsonify({"model": model_key, "threshold": threshold, "results": results})
+
+
+@app.route("/api/v1/score/stats", methods=["GET"])
+def score_stats():
+    with BATCHERS_LOCK:
+        batchers = {key: entry[1] for key, entry in BATCHERS.items()}
+    proba_cache = active_bundle().get("proba_cache")
+    return jsonify({
+        "batching_enabled": SCORE_BATCHING,
+        "models": {key: batcher.stats() for key, batcher in batchers.items()},
+        "proba_cache": proba_cache.stats() if proba_cache is not None else None,
+    })
 
 
 @app.route("/api/v1/explain", methods=["POST"])
@@ -308,247 +667,146 @@ def explain():
     model_key = data.get("model", "xgb")
     row_ids = data.get("row_ids", [])
     top_k = int(data.get("top_k", 8))
+    method = data.get("method", EXPLAIN_METHOD)
 
-    if not LAST_PREDICTIONS:
-        return jsonify({"error": "No predictions available. Run /predict first."}), 400
+    prediction = PREDICTIONS.get(data.get("prediction_id"))
+    if prediction is None:
+        return jsonify({"error": "Unknown or expired prediction_id. Run /predict first."}), 400
 
     metrics_data = load_metrics().get(model_key) or {}
     importance = metrics_data.get("feature_importance") or []
     importance_map = {item["feature"]: item["importance"] for item in importance}
 
-    def categorize(feature):
-        if feature.startswith("card"):
-            return "Card profile"
-        if feature.startswith("addr"):
-            return "Address"
-        if feature in {"P_emaildomain", "R_emaildomain"}:
-            return "Email domain"
-        if feature in {"DeviceType", "DeviceInfo"}:
-            return "Device"
-        if feature in {"TransactionAmt", "TransactionAmt_log", "TransactionAmt_by_card1", "TransactionAmt_by_device"}:
-            return "Amount"
-        if feature in {"TransactionDT", "hour"}:
-            return "Time"
-        if feature.startswith("id_"):
-            return "Identity"
-        return "Other"
-
-    explanations = []
-    features_df = LAST_PREDICTIONS.get("features")
-    raw_df = LAST_PREDICTIONS.get("raw")
-    if features_df is None or raw_df is None:
-        return jsonify({"error": "Prediction cache missing. Run /predict again."}), 400
-    for row_id in row_ids:
-        idx = int(row_id)
-        if idx < 0 or idx >= len(features_df):
-            continue
-        row = features_df.iloc[idx]
-        contributions = []
-        for feature, value in row.items():
-            val = 0.0 if pd.isna(value) else float(value)
-            weight = importance_map.get(feature)
-            score = val * float(weight) if weight is not None else val
-            contributions.append((feature, score))
-        positives = sorted([c for c in contributions if c[1] > 0], key=lambda x: x[1], reverse=True)[:top_k]
-        negatives = sorted([c for c in contributions if c[1] < 0], key=lambda x: x[1])[:top_k]
-        positives = [{"feature": f, "value": v} for f, v in positives]
-        negatives = [{"feature": f, "value": v} for f, v in negatives]
-
-        category_scores = {}
-        total_abs = 0.0
-        for feature, score in contributions:
-            cat = categorize(feature)
-            abs_score = abs(score)
-            total_abs += abs_score
-            category_scores[cat] = category_scores.get(cat, 0.0) + abs_score
-        category_breakdown = [
-            {"category": k, "percentage": (v / total_abs) * 100 if total_abs else 0.0}
-            for k, v in sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
-        ][:5]
-
-        raw_row = raw_df.iloc[idx]
-        simple_fields = []
-        def normalize_value(val):
-            if pd.isna(val):
-                return None
-            try:
-                return val.item()
-            except AttributeError:
-                return val
-
-        def add_simple(label, value, category_key):
-            pct = next((c["percentage"] for c in category_breakdown if c["category"] == category_key), 0.0)
-            simple_fields.append({"label": label, "value": normalize_value(value), "percentage": float(pct)})
-
-        if raw_row is not None:
-            add_simple("Transaction Amount", raw_row.get("TransactionAmt", None), "Amount")
-            add_simple("Card Type", raw_row.get("card4", None), "Card profile")
-            add_simple("Device Type", raw_row.get("DeviceType", None), "Device")
-            add_simple("Device Info", raw_row.get("DeviceInfo", None), "Device")
-            add_simple("Email Domain", raw_row.get("P_emaildomain", None), "Email domain")
-            add_simple("Address", raw_row.get("addr1", None), "Address")
-            add_simple("Hour", raw_row.get("hour", None), "Time")
-        pred_row = next((r for r in LAST_PREDICTIONS["rows"] if r["row_id"] == row_id), None)
-        explanations.append({
-            "row_id": row_id,
-            "proba": pred_row["proba"] if pred_row else 0.0,
-            "pred_label": pred_row["pred_label"] if pred_row else 0,
-            "positives": positives,
-            "negatives": negatives,
-            "category_breakdown": category_breakdown,
-            "simple_fields": simple_fields,
-        })
+    features = prediction["features"]
+    feature_columns = prediction["feature_columns"]
+    kept, positions = resolve_positions(row_ids, len(features))
+    contributions = shap_contributions(prediction, positions) if method == "shap" else None
+    if contributions is None:
+        method = "heuristic"
+        contributions = contribution_matrix(features[positions], feature_columns, importance_map)
+    explanations = explain_rows(
+        contributions,
+        feature_columns,
+        [row_ids[i] for i in kept],
+        top_k,
+        {col: values[positions] for col, values in prediction["raw"].items()},
+        prediction["proba"][positions],
+        prediction["pred_label"][positions],
+    )
 
-    return jsonify({"explanations": explanations})
+    return jsonify({"method": method, "explanations": explanations})
 
 
 @app.route("/api/v1/eda/upload", methods=["POST"])
 def upload_eda():
+    if request.form.get("approximate") == "1" or use_approximate_eda(request.files):
+        try:
+            return jsonify(compute_upload_eda_sketch(request.files, load_artifacts()))
+        except Exception as exc:
+            return jsonify({"error": str(exc)}), 400
     try:
         df, meta = read_upload_files(require_transaction=False)
     except Exception as exc:
         return jsonify({"error": str(exc)}), 400
 
-    artifacts = load_artifacts()
-    rows = int(df.shape[0])
-    cols = int(df.shape[1])
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    categorical_cols = df.select_dtypes(include="object").columns.tolist()
-    binary_cols = [col for col in df.columns if df[col].nunique(dropna=True) <= 2]
-
-    summary = {
-        "rows": rows,
-        "columns": cols,
-        "numeric_columns": int(len(numeric_cols)),
-        "categorical_columns": int(len(categorical_cols)),
-        "binary_columns": int(len(binary_cols)),
-        "transaction_id_present": "TransactionID" in df.columns,
-        "dataset_type": meta.get("dataset_type"),
-        "upload_timestamp": datetime.utcnow().isoformat(),
-        "file_size_bytes": int(sum(f.get("size_bytes") or 0 for f in meta.get("files", []))),
-        "files": meta.get("files", []),
-    }
+    return jsonify(compute_upload_eda(df, meta, load_artifacts()))
 
-    total_cells = rows * cols if rows and cols else 0
-    total_missing = int(df.isnull().sum().sum())
-    overall_missing_pct = (total_missing / total_cells) * 100 if total_cells else 0.0
-    rows_with_missing_pct = float(df.isnull().any(axis=1).mean() * 100) if rows else 0.0
 
-    missing_counts = df.isnull().sum().sort_values(ascending=False)
-    missingness = (
-        missing_counts.head(20)
-        .reset_index()
-        .rename(columns={"index": "feature", 0: "missing"})
-    )
-    missingness["missing_pct"] = (missingness["missing"] / rows * 100) if rows else 0.0
-
-    def cat_distribution(series, top=10):
-        counts = series.dropna().astype(str).value_counts().head(top)
-        return [{"label": idx, "value": int(val)} for idx, val in counts.items()]
-
-    distributions = {}
-    if "TransactionAmt" in df.columns:
-        transaction_amount = df["TransactionAmt"].dropna()
-        hist = transaction_amount.value_counts(bins=20).sort_index()
-        distributions["transaction_amount"] = [
-            {"label": f"{interval.left:.2f}-{interval.right:.2f}", "value": int(count)}
-            for interval, count in hist.items()
-        ]
-        log_vals = transaction_amount.apply(lambda v: math.log1p(v) if v > 0 else 0)
-        hist_log = log_vals.value_counts(bins=20).sort_index()
-        distributions["transaction_amount_log"] = [
-            {"label": f"{interval.left:.2f}-{interval.right:.2f}", "value": int(count)}
-            for interval, count in hist_log.items()
-        ]
-
-    if "TransactionDT" in df.columns:
-        numeric_dt = pd.to_numeric(df["TransactionDT"], errors="coerce")
-        hour_series = ((numeric_dt / 3600) % 24).round(0)
-        distributions["hour"] = cat_distribution(hour_series, top=24)
-    elif "hour" in df.columns:
-        distributions["hour"] = cat_distribution(df["hour"], top=24)
-
-    for col, key in [
-        ("ProductCD", "product_cd"),
-        ("DeviceType", "device_type"),
-        ("card4", "card4"),
-        ("P_emaildomain", "email_domain"),
-    ]:
-        if col in df.columns:
-            distributions[key] = cat_distribution(df[col], top=10)
-
-    def numeric_stats(series):
-        clean = series.dropna()
-        if clean.empty:
-            return None
-        q1 = clean.quantile(0.25)
-        q3 = clean.quantile(0.75)
-        iqr = q3 - q1
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
-        return {
-            "min": float(clean.min()),
-            "max": float(clean.max()),
-            "mean": float(clean.mean()),
-            "median": float(clean.median()),
-            "std": float(clean.std()),
-            "outliers": int(((clean < lower) | (clean > upper)).sum()),
-        }
+def compute_upload_eda(df, meta, artifacts):
+    return profile_upload(df, meta, build_schema_alignment(df, artifacts))
 
-    stats = {}
-    for col in ["TransactionAmt", "hour", "card1", "addr1"]:
-        if col in df.columns:
-            stats[col] = numeric_stats(df[col])
-
-    id_cols = [col for col in df.columns if col.startswith("id_")]
-    identity_analysis = None
-    if id_cols:
-        id_missing = df[id_cols].isnull().sum().sum()
-        id_total = len(id_cols) * rows if rows else 0
-        rows_with_many_missing = int((df[id_cols].isnull().sum(axis=1) >= 5).sum()) if rows else 0
-        identity_analysis = {
-            "id_columns_present": len(id_cols),
-            "id_missing_percent": (id_missing / id_total) * 100 if id_total else 0.0,
-            "rows_with_many_missing_ids": rows_with_many_missing,
-        }
 
-    duplicates = None
-    if "TransactionID" in df.columns:
-        duplicates = {"transaction_id_duplicates": int(df["TransactionID"].duplicated().sum())}
+def use_approximate_eda(files):
+    if EDA_APPROXIMATE_MIN_MB <= 0:
+        return False
+    size = sum(f.get("size_bytes") or 0 for f in upload_meta(files)["files"])
+    return size >= EDA_APPROXIMATE_MIN_MB * 1024 * 1024
 
-    schema_alignment = build_schema_alignment(df, artifacts)
 
-    warnings = []
-    if identity_analysis and identity_analysis["id_missing_percent"] > 30:
-        warnings.append("Identity features are heavily missing; risk signals may be weaker.")
-    if overall_missing_pct > 20:
-        warnings.append("High overall missingness detected; results may be less reliable.")
-    if "TransactionDT" not in df.columns:
-        warnings.append("TransactionDT missing; hour feature may be imputed or unavailable.")
+def compute_upload_eda_sketch(files, artifacts, report=None):
+    meta = upload_meta(files)
+    if not meta["files"]:
+        raise ValueError("Provide file_merged or file_transaction.")
+    source = files.get(meta["files"][0]["field"]).stream
+    source_size = meta["files"][0]["size_bytes"] or 1
+
+    pipeline = get_feature_pipeline(artifacts)
+    sketch = UploadSketch()
+    unseen = {}
+    schema = None
+    for chunk in iter_upload_chunks(EDA_CHUNKSIZE, files=files, require_transaction=False):
+        sketch.update(chunk)
+        for col, values in pipeline.unseen_categories(chunk).items():
+            unseen.setdefault(col, set()).update(values)
+        schema = chunk.iloc[:0] if schema is None else schema
+        if report is not None:
+            report(progress=min(source.tell() / source_size, 0.99), rows=sketch.rows, columns=len(sketch.columns))
+    if schema is None:
+        raise ValueError("Uploaded file has no rows.")
+    return sketch.result(meta, build_schema_alignment(schema, artifacts, unseen))
+
+
+@app.route("/api/v1/jobs", methods=["POST"])
+def submit_job():
+    kind = request.form.get("kind", "predict")
+    files = {field: request.files.get(field) for field in ["file_merged", "file_transaction", "file_identity"]}
+    if kind == "predict":
+        model_key = request.form.get("model", "xgb")
+        if model_key not in load_artifacts().get("models", {}):
+            return jsonify({"error": f"Model not available: {model_key}"}), 404
+        if files["file_merged"] is None and files["file_transaction"] is None:
+            return jsonify({"error": "Provide file_transaction (transaction data required for prediction)."}), 400
+        threshold = float(request.form.get("threshold", 0.5)) if model_key == "stack" else 0.5
+        params = {"model_key": model_key, "threshold": threshold}
+        fn = run_predict_job
+    elif kind == "eda":
+        if not any(files.values()):
+            return jsonify({"error": "Provide file_merged or file_transaction."}), 400
+        params = {"approximate": request.form.get("approximate") == "1"}
+        fn = run_eda_job
+    else:
+        return jsonify({"error": f"Unknown job kind: {kind}"}), 400
 
+    try:
+        job = JOBS.submit(kind, files, fn, **params)
+    except RuntimeError as exc:
+        return jsonify({"error": str(exc)}), 429
+    return jsonify(job.snapshot()), 202
+
+
+@app.route("/api/v1/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job.snapshot())
+
+
+@app.route("/api/v1/jobs/<job_id>/results", methods=["GET"])
+def job_results(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    snapshot = job.snapshot()
+    if snapshot["status"] == "failed":
+        return jsonify({"error": snapshot["error"]}), 500
+    if snapshot["status"] != "succeeded":
+        return jsonify({"error": "Job is not finished yet.", "status": snapshot["status"]}), 409
+    if job.kind != "predict":
+        return jsonify(job.result)
+
+    offset = max(int(request.args.get("offset", 0)), 0)
+    limit = min(max(int(request.args.get("limit", 1000)), 1), MAX_JOB_PAGE)
     return jsonify({
-        "summary": summary,
-        "missingness": {
-            "overall_missing_pct": overall_missing_pct,
-            "rows_with_missing_pct": rows_with_missing_pct,
-            "top": missingness.to_dict(orient="records"),
-        },
-        "type_breakdown": {
-            "numeric": len(numeric_cols),
-            "categorical": len(categorical_cols),
-            "binary": len(binary_cols),
-        },
-        "stats": stats,
-        "distributions": distributions,
-        "identity_analysis": identity_analysis,
-        "schema_alignment": schema_alignment,
-        "duplicates": duplicates,
-        "warnings": warnings,
+        "summary": snapshot["summary"],
+        "total": snapshot["rows"],
+        "offset": offset,
+        "limit": limit,
+        "rows": job.page(offset, limit),
     })
 
 
 if __name__ == "__main__":
-    import os
-
     port = int(os.environ.get("PORT", "5000"))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    app.run(host="0.0.0.0", port=port, debug=os.environ.get("FLASK_DEBUG", "0") == "1")
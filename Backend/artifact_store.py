@@ -0,0 +1,271 @@
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import tempfile
+import threading
+import joblib
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from feature_pipeline import FeaturePipeline
+from models import CatBoostSklearn
+from preprocessing import category_index
+from stacking import StackedEnsemble
+
+ARTIFACT_STORE_DIRNAME = "artifacts"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+PREPROCESSING_FILE = "preprocessing.json"
+
+
+def is_stack(model):
+    return isinstance(model, StackedEnsemble) or (hasattr(model, "estimators_") and hasattr(model, "final_estimator_"))
+
+
+def model_format(model):
+    if is_stack(model):
+        return "stacked", "json"
+    if hasattr(model, "get_booster"):
+        return "xgboost", "ubj"
+    if hasattr(model, "get_feature_importance") and hasattr(model, "save_model"):
+        return "catboost", "cbm"
+    return "joblib", "joblib"
+
+
+def save_model_file(model, path: Path, fmt):
+    if fmt == "xgboost":
+        model.get_booster().save_model(path)
+    elif fmt == "catboost":
+        model.save_model(str(path), format="cbm")
+    else:
+        joblib.dump(model, path)
+
+
+def model_fingerprint(model, fmt):
+    if fmt == "xgboost":
+        return bytes(model.get_booster().save_raw(raw_format="ubj"))
+    if fmt == "catboost":
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.json"
+            model.save_model(str(path), format="json")
+            config = json.loads(path.read_text())
+        config.pop("model_info", None)
+        return json.dumps(config, sort_keys=True)
+    return None
+
+
+def same_model(a, b):
+    fmt = model_format(a)[0]
+    if a is b:
+        return True
+    if b is None or model_format(b)[0] != fmt:
+        return False
+    fingerprint = model_fingerprint(a, fmt)
+    return fingerprint is not None and fingerprint == model_fingerprint(b, fmt)
+
+
+def save_stack(key, model, path: Path, models, model_entries):
+    ensemble = model if isinstance(model, StackedEnsemble) else StackedEnsemble.from_stacking_classifier(model)
+    meta = ensemble.meta()
+    meta["base_models"] = []
+    for name, base in ensemble.base_models.items():
+        fmt, extension = model_format(base)
+        if name in model_entries and same_model(base, models.get(name)):
+            filename = model_entries[name]["file"]
+        else:
+            filename = f"{key}_{name}.{extension}"
+            save_model_file(base, path.parent / filename, fmt)
+        meta["base_models"].append({"name": name, "file": filename, "format": fmt})
+    path.write_text(json.dumps(meta))
+
+
+def load_model_file(path: Path, fmt):
+    if fmt == "xgboost":
+        model = XGBClassifier()
+        model.load_model(path)
+        return model
+    if fmt == "catboost":
+        model = CatBoostSklearn()
+        model.load_model(str(path), format="cbm")
+        return model
+    return joblib.load(path)
+
+
+def scaler_to_json(scaler):
+    return {
+        "mean": np.asarray(scaler.mean_, dtype=np.float64).tolist(),
+        "var": np.asarray(scaler.var_, dtype=np.float64).tolist(),
+        "scale": np.asarray(scaler.scale_, dtype=np.float64).tolist(),
+        "n_samples_seen": np.asarray(scaler.n_samples_seen_).tolist(),
+        "feature_names": [str(name) for name in getattr(scaler, "feature_names_in_", [])],
+    }
+
+
+def scaler_from_json(data):
+    scaler = StandardScaler()
+    scaler.mean_ = np.array(data["mean"], dtype=np.float64)
+    scaler.var_ = np.array(data["var"], dtype=np.float64)
+    scaler.scale_ = np.array(data["scale"], dtype=np.float64)
+    scaler.n_samples_seen_ = np.asarray(data["n_samples_seen"])
+    scaler.n_features_in_ = len(scaler.mean_)
+    if data["feature_names"]:
+        scaler.feature_names_in_ = np.array(data["feature_names"], dtype=object)
+    return scaler
+
+
+def save_artifact_store(artifacts, directory):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    amount_means = artifacts.get("amount_means")
+    amount_json = None
+    if amount_means is not None:
+        amount_json = {"fallback": float(amount_means["fallback"]), "tables": {}}
+        for key_col, table in amount_means.items():
+            if key_col == "fallback":
+                continue
+            filename = f"amount_{key_col}.npy"
+            np.save(directory / filename, np.asarray(table["means"], dtype=np.float64))
+            amount_json["tables"][key_col] = {"offset": int(table["offset"]), "file": filename}
+
+    preprocessing = {
+        "feature_columns": list(artifacts.get("feature_columns", [])),
+        "cat_cols": list(artifacts.get("cat_cols", [])),
+        "medians": {col: float(value) for col, value in artifacts.get("medians", {}).items()},
+        "encoders": {col: [str(c) for c in classes] for col, classes in artifacts.get("encoders", {}).items()},
+        "scaler": scaler_to_json(artifacts["scaler"]),
+        "amount_means": amount_json,
+    }
+    (directory / PREPROCESSING_FILE).write_text(json.dumps(preprocessing))
+
+    models = {key: model for key, model in artifacts.get("models", {}).items() if model is not None}
+    model_entries = {}
+    for key, model in sorted(models.items(), key=lambda item: is_stack(item[1])):
+        fmt, extension = model_format(model)
+        filename = f"{key}.{extension}"
+        if fmt == "stacked":
+            save_stack(key, model, directory / filename, models, model_entries)
+        else:
+            save_model_file(model, directory / filename, fmt)
+        model_entries[key] = {"file": filename, "format": fmt}
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "preprocessing": PREPROCESSING_FILE,
+        "models": model_entries,
+        "files": {
+            path.name: path.stat().st_size
+            for path in sorted(directory.iterdir())
+            if path.is_file() and path.name != MANIFEST_FILE
+        },
+    }
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+class LazyModels(Mapping):
+    def __init__(self, directory: Path, entries):
+        self.directory = directory
+        self.entries = entries
+        self.loaded = {}
+        self.lock = threading.RLock()
+
+    def __getitem__(self, key):
+        if key not in self.entries:
+            raise KeyError(key)
+        if key not in self.loaded:
+            with self.lock:
+                if key not in self.loaded:
+                    entry = self.entries[key]
+                    if entry["format"] == "stacked":
+                        self.loaded[key] = self.load_stack(self.directory / entry["file"])
+                    else:
+                        self.loaded[key] = load_model_file(self.directory / entry["file"], entry["format"])
+        return self.loaded[key]
+
+    def load_stack(self, path: Path):
+        meta = json.loads(path.read_text())
+        shared = {entry["file"]: key for key, entry in self.entries.items()}
+        base_models = {}
+        for base in meta["base_models"]:
+            if base["file"] in shared:
+                base_models[base["name"]] = self[shared[base["file"]]]
+            else:
+                base_models[base["name"]] = load_model_file(self.directory / base["file"], base["format"])
+        return StackedEnsemble(base_models, meta["coef"], meta["intercept"], meta["passthrough"])
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def loaded_keys(self):
+        return list(self.loaded)
+
+
+class LazyArtifacts(Mapping):
+    def __init__(self, directory, mmap: bool = False):
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / MANIFEST_FILE).read_text())
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact store format: {self.manifest.get('format_version')}")
+        preprocessing = json.loads((self.directory / self.manifest["preprocessing"]).read_text())
+
+        amount_means = None
+        if preprocessing["amount_means"] is not None:
+            amount_means = {"fallback": preprocessing["amount_means"]["fallback"]}
+            for key_col, table in preprocessing["amount_means"]["tables"].items():
+                means = np.load(self.directory / table["file"], mmap_mode="r" if mmap else None)
+                amount_means[key_col] = {"offset": table["offset"], "means": means}
+
+        self.items_ = {
+            "models": LazyModels(self.directory, self.manifest["models"]),
+            "scaler": scaler_from_json(preprocessing["scaler"]),
+            "encoders": {col: category_index(classes) for col, classes in preprocessing["encoders"].items()},
+            "medians": preprocessing["medians"],
+            "cat_cols": preprocessing["cat_cols"],
+            "amount_means": amount_means,
+            "feature_columns": preprocessing["feature_columns"],
+        }
+        self.items_["feature_pipeline"] = FeaturePipeline.from_artifacts(self.items_)
+
+    def __getitem__(self, key):
+        return self.items_[key]
+
+    def __iter__(self):
+        return iter(self.items_)
+
+    def __len__(self):
+        return len(self.items_)
+
+
+def open_artifact_store(directory, mmap: bool = False):
+    return LazyArtifacts(directory, mmap=mmap)
+
+
+def is_artifact_store(path):
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def load_artifacts_from(path, mmap: bool = False):
+    path = Path(path)
+    if path.is_dir():
+        return open_artifact_store(path, mmap=mmap)
+    artifacts = joblib.load(path)
+    if "encoders" in artifacts:
+        artifacts["encoders"] = {col: category_index(classes) for col, classes in artifacts["encoders"].items()}
+    return artifacts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert artifacts.joblib into a per-component artifact store")
+    parser.add_argument("source", help="Path to artifacts.joblib")
+    parser.add_argument("target", help="Directory to write the artifact store to")
+    args = parser.parse_args()
+    manifest = save_artifact_store(joblib.load(args.source), args.target)
+    print(f"Wrote {len(manifest['files'])} files to {args.target}")
@@ -0,0 +1,117 @@
+from concurrent.futures import Future
+import queue
+import threading
+import time
+import numpy as np
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_wait_ms: float = 2.0, max_rows: int = 256):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000
+        self.max_rows = max_rows
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = False
+        self.state_lock = threading.Lock()
+        self.metrics = {
+            "batches": 0,
+            "requests": 0,
+            "rows": 0,
+            "max_batch_rows": 0,
+            "queue_delay_ms_total": 0.0,
+            "queue_delay_ms_max": 0.0,
+        }
+        self.worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, X) -> Future:
+        future = Future()
+        X = np.asarray(X, dtype=np.float32)
+        with self.state_lock:
+            if not self.closed:
+                self.pending.put((X, future, time.perf_counter()))
+                return future
+        try:
+            future.set_result(self.predict_fn(X))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def close(self):
+        with self.state_lock:
+            if not self.closed:
+                self.closed = True
+                self.pending.put(None)
+
+    def predict(self, X):
+        return self.submit(X).result()
+
+    def stats(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+        batches = metrics["batches"] or 1
+        requests = metrics["requests"] or 1
+        return {
+            "batches": metrics["batches"],
+            "requests": metrics["requests"],
+            "rows": metrics["rows"],
+            "mean_batch_rows": metrics["rows"] / batches,
+            "mean_batch_requests": metrics["requests"] / batches,
+            "max_batch_rows": metrics["max_batch_rows"],
+            "mean_queue_delay_ms": metrics["queue_delay_ms_total"] / requests,
+            "max_queue_delay_ms": metrics["queue_delay_ms_max"],
+            "max_wait_ms": self.max_wait * 1000,
+            "max_rows": self.max_rows,
+        }
+
+    def _collect(self):
+        first = self.pending.get()
+        if first is None:
+            return [], 0, True
+        batch = [first]
+        rows = len(first[0])
+        deadline = batch[0][2] + self.max_wait
+        while rows < self.max_rows:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, rows, True
+            batch.append(item)
+            rows += len(item[0])
+        return batch, rows, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, rows, stopping = self._collect()
+            if batch:
+                self._process(batch, rows)
+
+    def _process(self, batch, rows):
+        dispatched = time.perf_counter()
+        delays = [(dispatched - enqueued) * 1000 for _, _, enqueued in batch]
+        with self.lock:
+            self.metrics["batches"] += 1
+            self.metrics["requests"] += len(batch)
+            self.metrics["rows"] += rows
+            self.metrics["max_batch_rows"] = max(self.metrics["max_batch_rows"], rows)
+            self.metrics["queue_delay_ms_total"] += sum(delays)
+            self.metrics["queue_delay_ms_max"] = max(self.metrics["queue_delay_ms_max"], max(delays))
+
+        try:
+            X = batch[0][0] if len(batch) == 1 else np.vstack([item[0] for item in batch])
+            proba = self.predict_fn(X)
+            offset = 0
+            for X_item, future, _ in batch:
+                future.set_result(proba[offset:offset + len(X_item)])
+                offset += len(X_item)
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
@@ -0,0 +1,99 @@
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import joblib
+import numpy as np
+
+from synthetic import BACKEND_DIR, DEFAULT_ARTIFACTS, make_upload_frame
+from artifact_store import open_artifact_store, save_artifact_store
+
+COLD_SCRIPT = """
+import sys, time
+sys.path.insert(0, {backend!r})
+import joblib, models, feature_pipeline
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+COLD_CASES = {
+    "joblib full load": "artifacts = joblib.load({joblib_path!r})\nartifacts['models']['{model}']",
+    "store open": "from artifact_store import open_artifact_store\nartifacts = open_artifact_store({store!r}, mmap=True)",
+    "store open + {model}": (
+        "from artifact_store import open_artifact_store\n"
+        "artifacts = open_artifact_store({store!r}, mmap=True)\nartifacts['models']['{model}']"
+    ),
+    "store open + all models": (
+        "from artifact_store import open_artifact_store\n"
+        "artifacts = open_artifact_store({store!r}, mmap=True)\n[m for m in artifacts['models'].values()]"
+    ),
+}
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cold_start(body, repeats):
+    script = COLD_SCRIPT.format(backend=str(BACKEND_DIR), body=body)
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup cost of artifacts.joblib vs the per-component artifact store")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--model", default="xgb")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = joblib.load(args.artifacts)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / "artifacts"
+        manifest = save_artifact_store(artifacts, store)
+        print(f"joblib: {Path(args.artifacts).stat().st_size / 1e6:.1f} MB")
+        print(f"store:  {sum(manifest['files'].values()) / 1e6:.1f} MB in {len(manifest['files'])} files")
+
+        lazy = open_artifact_store(store, mmap=True)
+        df = make_upload_frame(artifacts, 5000)
+        X = artifacts["feature_pipeline"].transform_frame(df)
+        for key, model in artifacts["models"].items():
+            if model is None:
+                continue
+            diff = np.abs(model.predict_proba(X)[:, 1] - lazy["models"][key].predict_proba(X)[:, 1]).max()
+            print(f"parity {key:<6} max |diff| {diff:.2e}")
+
+        print("\nin-process (best of {})".format(args.repeats))
+        timings = {
+            "joblib full load": best_of(lambda: joblib.load(args.artifacts), args.repeats),
+            "store open": best_of(lambda: open_artifact_store(store, mmap=True), args.repeats),
+            f"store open + {args.model}": best_of(
+                lambda: open_artifact_store(store, mmap=True)["models"][args.model], args.repeats
+            ),
+            "store open + all models": best_of(
+                lambda: list(open_artifact_store(store, mmap=True)["models"].values()), args.repeats
+            ),
+        }
+        for name, elapsed in timings.items():
+            print(f"{name:<28} {elapsed * 1000:9.1f} ms")
+
+        print("\nfresh process, libraries imported before timing (best of {})".format(args.repeats))
+        for name, body in COLD_CASES.items():
+            body = body.format(joblib_path=str(args.artifacts), store=str(store), model=args.model)
+            elapsed = cold_start(body, args.repeats)
+            print(f"{name.format(model=args.model):<28} {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
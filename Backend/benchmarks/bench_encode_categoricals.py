@@ -0,0 +1,65 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from preprocessing import encode_categoricals, fill_categorical
+
+
+def legacy_encode_categoricals(df, cat_cols, encoders):
+    df = df.copy()
+    for col in cat_cols:
+        classes = encoders.get(col, [])
+        mapping = {cls: idx for idx, cls in enumerate(classes)}
+        df[col] = df[col].astype(str).map(mapping).fillna(-1).astype(int)
+    return df
+
+
+def measure(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dict-mapped vs lookup-table categorical encoding")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    df, cat_cols = fill_categorical(make_upload_frame(artifacts, args.rows))
+    cat_cols = [col for col in cat_cols if col in artifacts["encoders"]]
+    lists = {col: list(classes) for col, classes in artifacts["encoders"].items()}
+
+    legacy, legacy_time, legacy_peak = measure(lambda: legacy_encode_categoricals(df, cat_cols, lists), args.repeats)
+    fresh, fresh_time, fresh_peak = measure(lambda: encode_categoricals(df, cat_cols, dict(lists))[0], args.repeats)
+    tables, table_time, table_peak = measure(lambda: encode_categoricals(df, cat_cols, artifacts["encoders"])[0], args.repeats)
+
+    vocabulary = sum(len(lists[col]) for col in cat_cols)
+    print(f"rows={args.rows} categorical columns={len(cat_cols)} vocabulary={vocabulary}")
+    for name, elapsed, peak in [
+        ("legacy dict map     ", legacy_time, legacy_peak),
+        ("lookup, list encoders", fresh_time, fresh_peak),
+        ("lookup, stored tables", table_time, table_peak),
+    ]:
+        print(f"{name}: {elapsed * 1000:8.1f} ms  {args.rows * len(cat_cols) / elapsed / 1e6:7.1f} M values/s  "
+              f"peak {peak / 1e6:7.1f} MB")
+    print(f"speedup (stored tables): {legacy_time / table_time:.1f}x")
+    print(f"codes bytes: legacy {legacy[cat_cols].memory_usage(index=False).sum() / 1e6:.1f} MB "
+          f"lookup {tables[cat_cols].memory_usage(index=False).sum() / 1e6:.1f} MB")
+    same = all(np.array_equal(legacy[col].to_numpy(), tables[col].to_numpy()) for col in cat_cols)
+    print(f"identical codes: {same and fresh[cat_cols].equals(tables[cat_cols])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import math
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from explanations import SIMPLE_FIELDS, categorize, contribution_matrix, explain_rows
+from feature_pipeline import FeaturePipeline
+from prediction_store import compact_raw_columns
+
+
+def normalize_value(val):
+    if pd.isna(val):
+        return None
+    try:
+        return val.item()
+    except AttributeError:
+        return val
+
+
+def legacy_explain(features, feature_columns, raw, proba, pred_label, importance_map, row_ids, top_k):
+    explanations = []
+    for row_id in row_ids:
+        idx = int(row_id)
+        contributions = []
+        for feature, value in zip(feature_columns, features[idx]):
+            val = 0.0 if value != value else float(value)
+            weight = importance_map.get(feature)
+            contributions.append((feature, val * float(weight) if weight is not None else val))
+        positives = sorted([c for c in contributions if c[1] > 0], key=lambda x: x[1], reverse=True)[:top_k]
+        negatives = sorted([c for c in contributions if c[1] < 0], key=lambda x: x[1])[:top_k]
+
+        category_scores = {}
+        total_abs = 0.0
+        for feature, score in contributions:
+            cat = categorize(feature)
+            total_abs += abs(score)
+            category_scores[cat] = category_scores.get(cat, 0.0) + abs(score)
+        category_breakdown = [
+            {"category": k, "percentage": (v / total_abs) * 100 if total_abs else 0.0}
+            for k, v in sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
+        ][:5]
+        simple_fields = [
+            {
+                "label": label,
+                "value": normalize_value(raw[col][idx]) if col in raw else None,
+                "percentage": next((c["percentage"] for c in category_breakdown if c["category"] == cat), 0.0),
+            }
+            for label, col, cat in SIMPLE_FIELDS
+        ]
+        explanations.append({
+            "row_id": row_id,
+            "proba": float(proba[idx]),
+            "pred_label": int(pred_label[idx]),
+            "positives": [{"feature": f, "value": v} for f, v in positives],
+            "negatives": [{"feature": f, "value": v} for f, v in negatives],
+            "category_breakdown": category_breakdown,
+            "simple_fields": simple_fields,
+        })
+    return explanations
+
+
+def vectorized_explain(features, feature_columns, raw, proba, pred_label, importance_map, row_ids, top_k):
+    positions = np.array([int(row_id) for row_id in row_ids])
+    contributions = contribution_matrix(features[positions], feature_columns, importance_map)
+    return explain_rows(
+        contributions,
+        feature_columns,
+        row_ids,
+        top_k,
+        {col: values[positions] for col, values in raw.items()},
+        proba[positions],
+        pred_label[positions],
+    )
+
+
+def same_explanations(a, b):
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(same_explanations(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(same_explanations(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy per-row explain loop vs vectorized explanations")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    pipeline = FeaturePipeline.from_artifacts(artifacts)
+    rng = np.random.default_rng(0)
+    importance_map = {col: float(w) for col, w in zip(pipeline.feature_columns, rng.random(len(pipeline.feature_columns)))}
+
+    for n_rows in args.rows:
+        df = make_upload_frame(artifacts, n_rows, seed=n_rows)
+        inputs = (
+            pipeline.transform(df),
+            pipeline.feature_columns,
+            compact_raw_columns(df),
+            rng.random(n_rows).astype(np.float32),
+            (rng.random(n_rows) > 0.5).astype(np.int8),
+            importance_map,
+            [str(i) for i in range(n_rows)],
+            args.top_k,
+        )
+        timings = {}
+        results = {}
+        for name, fn in [("legacy", legacy_explain), ("vectorized", vectorized_explain)]:
+            samples = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                results[name] = fn(*inputs)
+                samples.append(time.perf_counter() - start)
+            timings[name] = min(samples)
+
+        assert same_explanations(results["legacy"], results["vectorized"]), "explanations differ"
+        tied = (np.clip(np.round(inputs[0]), -2, 2), inputs[1], *inputs[2:5], dict.fromkeys(inputs[1], 1.0), *inputs[6:])
+        assert same_explanations(legacy_explain(*tied), vectorized_explain(*tied)), "tied explanations differ"
+        print(
+            f"rows={n_rows:<7} legacy {timings['legacy'] * 1000:9.2f} ms  "
+            f"vectorized {timings['vectorized'] * 1000:8.2f} ms  "
+            f"speedup {timings['legacy'] / timings['vectorized']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
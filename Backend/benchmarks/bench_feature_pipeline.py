@@ -0,0 +1,73 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from feature_pipeline import FeaturePipeline
+from preprocessing import add_hour_feature, impute_numerical, fill_categorical, add_missing_indicators, encode_categoricals
+from feature_engineering import add_amount_features
+from scaling import scale_numeric
+
+LEGACY_COLUMNS = [
+    "TransactionID", "TransactionDT", "TransactionAmt", "ProductCD",
+    "card1", "card2", "card3", "card4", "card5", "card6",
+    "addr1", "addr2", "P_emaildomain", "R_emaildomain",
+    "DeviceType", "DeviceInfo",
+]
+
+
+def legacy_chain(df, artifacts):
+    df = df.copy()
+    keep = LEGACY_COLUMNS + [col for col in df.columns if "id_" in col]
+    df = df[[col for col in keep if col in df.columns]]
+    df = add_hour_feature(df)
+    df, _, _ = impute_numerical(df, artifacts.get("medians"))
+    df, cat_cols = fill_categorical(df)
+    df = add_missing_indicators(df)
+    df, _ = encode_categoricals(df, cat_cols, artifacts.get("encoders"))
+    df, _ = add_amount_features(df, artifacts.get("amount_means"))
+    feature_columns = artifacts.get("feature_columns", [])
+    for col in feature_columns:
+        if col not in df.columns:
+            df[col] = 0
+    df, _ = scale_numeric(df, artifacts.get("scaler"), feature_columns=feature_columns)
+    return df[feature_columns]
+
+
+def measure(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy preprocessing chain vs fused FeaturePipeline")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    pipeline = artifacts.get("feature_pipeline") or FeaturePipeline.from_artifacts(artifacts)
+    df = make_upload_frame(artifacts, args.rows)
+
+    legacy, legacy_time, legacy_peak = measure(lambda: legacy_chain(df, artifacts), args.repeats)
+    fused, fused_time, fused_peak = measure(lambda: pipeline.transform(df), args.repeats)
+
+    print(f"rows={args.rows} features={fused.shape[1]}")
+    print(f"legacy chain : {legacy_time * 1000:9.1f} ms  peak {legacy_peak / 1e6:8.1f} MB")
+    print(f"fused        : {fused_time * 1000:9.1f} ms  peak {fused_peak / 1e6:8.1f} MB")
+    print(f"speedup      : {legacy_time / fused_time:9.1f}x")
+    print(f"max abs diff : {np.nanmax(np.abs(legacy.to_numpy(dtype=np.float64) - fused)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import os
+import time
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from feature_pipeline import FeaturePipeline
+from parallel_scoring import ParallelScorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of in-process vs process-pool scoring")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--model", default="xgb")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--shard-rows", type=int, default=20_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    pipeline = FeaturePipeline.from_artifacts(artifacts)
+    model = artifacts["models"][args.model]
+    df = make_upload_frame(artifacts, args.rows)
+    print(f"rows={args.rows} model={args.model} cpus={os.cpu_count()}")
+
+    start = time.perf_counter()
+    expected = model.predict_proba(pipeline.transform_frame(df))[:, 1]
+    baseline = time.perf_counter() - start
+    print(f"in-process   {baseline:7.2f} s  {args.rows / baseline:10.0f} rows/s")
+
+    for workers in range(1, args.max_workers + 1):
+        scorer = ParallelScorer(args.artifacts, workers=workers, shard_rows=args.shard_rows)
+        scorer.warm_up()
+        start = time.perf_counter()
+        proba = scorer.predict_proba(args.model, df)
+        elapsed = time.perf_counter() - start
+        scorer.close()
+        assert np.allclose(proba, expected, atol=1e-6), "parallel scores differ"
+        print(
+            f"workers={workers:<3} {elapsed:7.2f} s  {args.rows / elapsed:10.0f} rows/s  "
+            f"speedup {baseline / elapsed:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
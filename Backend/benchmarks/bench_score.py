@@ -0,0 +1,54 @@
+import argparse
+import time
+from pathlib import Path
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_records
+import api_app
+
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    return f"p50 {np.percentile(values, 50):7.3f} ms  p99 {np.percentile(values, 99):7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the JSON /api/v1/score endpoint")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--model", default="xgb")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    artifacts_path = Path(args.artifacts)
+    api_app.RESULTS_DIR = artifacts_path.parent
+    artifacts = load_benchmark_artifacts(artifacts_path)
+    pipeline = api_app.get_feature_pipeline(api_app.load_artifacts())
+    model = artifacts["models"][args.model]
+    client = api_app.app.test_client()
+
+    for batch_size in args.batch_sizes:
+        records = make_records(artifacts, batch_size, seed=batch_size)
+        payload = {"model": args.model, "transactions": records}
+        features, scoring, endpoint = [], [], []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            X = pipeline.transform_records(records)
+            features.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            model.predict_proba(X)
+            scoring.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            response = client.post("/api/v1/score", json=payload)
+            endpoint.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.data
+
+        print(f"batch={batch_size:<4} features  {percentiles(features)}")
+        print(f"           predict   {percentiles(scoring)}")
+        print(f"           endpoint  {percentiles(endpoint)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import time
+import joblib
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, make_upload_frame
+from stacking import CachedScorer, ProbaCache, StackedEnsemble
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StackingClassifier.predict_proba vs StackedEnsemble")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS), help="artifacts.joblib with a sklearn stack")
+    parser.add_argument("--rows", default="1,100,10000,100000")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = joblib.load(args.artifacts)
+    models = artifacts["models"]
+    stack = models["stack"]
+    if stack is None:
+        raise SystemExit("No stacking model in these artifacts.")
+    ensemble = StackedEnsemble.from_stacking_classifier(stack)
+    row_counts = [int(n) for n in args.rows.split(",")]
+    X_all = artifacts["feature_pipeline"].transform_frame(make_upload_frame(artifacts, max(row_counts)))
+
+    print(f"{'rows':>8} {'sklearn':>10} {'ensemble':>10} {'xgb+cat':>10} {'cached':>10}  max |diff|")
+    for n_rows in row_counts:
+        X = X_all.iloc[:n_rows]
+        expected = stack.predict_proba(X)[:, 1]
+        diff = np.abs(ensemble.predict_proba(X)[:, 1] - expected).max()
+
+        cache = ProbaCache(max_entries=8, min_rows=0)
+        cached = ensemble.with_base_models(
+            {name: CachedScorer(base, name, cache) for name, base in ensemble.base_models.items()}, cache
+        )
+        for base in cached.base_models.values():
+            base.predict_proba(X)
+
+        repeats = args.repeats if n_rows < 50_000 else 1
+        timings = [
+            best_of(lambda: stack.predict_proba(X), repeats),
+            best_of(lambda: ensemble.predict_proba(X), repeats),
+            best_of(lambda: [base.predict_proba(X) for base in ensemble.base_models.values()], repeats),
+            best_of(lambda: cached.predict_proba(X), repeats),
+        ]
+        print(f"{n_rows:>8} " + " ".join(f"{t * 1000:7.1f} ms" for t in timings) + f"  {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import time
+import numpy as np
+from sklearn.metrics import confusion_matrix
+
+from synthetic import make_scores
+from evaluation import select_threshold, threshold_sweep
+
+
+def legacy_sweep(y_true, y_pred_proba, thresholds):
+    precisions, recalls = [], []
+    for t in thresholds:
+        preds = (y_pred_proba > t).astype(int)
+        cm = confusion_matrix(y_true, preds)
+        tp, fp, fn = cm[1, 1], cm[0, 1], cm[1, 0]
+        precisions.append(tp / (tp + fp + 1e-6))
+        recalls.append(tp / (tp + fn + 1e-6))
+    return np.array(precisions), np.array(recalls)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-threshold confusion matrices vs sorted cumulative sweep")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--fraud-rate", type=float, default=0.035)
+    parser.add_argument("--grid", type=int, default=100)
+    args = parser.parse_args()
+
+    y_true, scores = make_scores(args.rows, fraud_rate=args.fraud_rate)
+    thresholds = np.linspace(0, 1, args.grid)
+
+    (precision, recall), legacy_time = timed(lambda: legacy_sweep(y_true, scores, thresholds))
+    sweep, sweep_time = timed(lambda: threshold_sweep(y_true, scores, thresholds))
+    fine, fine_time = timed(lambda: threshold_sweep(y_true, scores, np.linspace(0, 1, 10_001)))
+
+    print(f"rows={args.rows} thresholds={args.grid}")
+    print(f"legacy confusion_matrix loop: {legacy_time * 1000:9.1f} ms")
+    print(f"threshold_sweep             : {sweep_time * 1000:9.1f} ms  ({legacy_time / sweep_time:.0f}x)")
+    print(f"threshold_sweep, 10001 grid : {fine_time * 1000:9.1f} ms")
+    print(f"max abs diff precision {np.abs(precision - sweep['precision']).max():.1e} "
+          f"recall {np.abs(recall - sweep['recall']).max():.1e}")
+    best = select_threshold(fine, "f1")
+    print(f"best f1 threshold {best['threshold']:.4f} (f1 {best['f1']:.4f}, precision {best['precision']:.4f}, "
+          f"recall {best['recall']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_training_frame
+from models import train_catboost, train_stacking, train_xgboost
+from training import FitCache, train_models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential fits + StackingClassifier vs the cached OOF orchestrator")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    X_train, y_train = make_training_frame(artifacts, args.rows)
+    X_test, _ = make_training_frame(artifacts, 5_000, seed=1)
+    print(f"rows={args.rows} features={X_train.shape[1]} cpus={os.cpu_count()} workers={args.workers}")
+
+    start = time.perf_counter()
+    xgb = train_xgboost(X_train, y_train)
+    cat = train_catboost(X_train, y_train)
+    stack = train_stacking(xgb, cat, X_train, y_train)
+    sequential = time.perf_counter() - start
+    expected = stack.predict_proba(X_test)[:, 1]
+    print(f"sequential + StackingClassifier  {sequential:8.1f} s  (14 fits)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ["orchestrator, cold cache", "orchestrator, warm cache"]:
+            start = time.perf_counter()
+            _, ensemble = train_models(X_train, y_train, workers=args.workers, cache=FitCache(tmp))
+            elapsed = time.perf_counter() - start
+            diff = np.abs(ensemble.predict_proba(X_test)[:, 1] - expected).max()
+            print(f"{label:<32} {elapsed:8.1f} s  max |diff| vs sklearn stack {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
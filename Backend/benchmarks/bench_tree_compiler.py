@@ -0,0 +1,61 @@
+import argparse
+import time
+import numpy as np
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from tree_compiler import compile_model
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Library predict_proba vs compiled NumPy trees vs native fast path")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--models", default="xgb,cat,stack")
+    parser.add_argument("--rows", default="1,100,100000")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    pipeline = artifacts["feature_pipeline"]
+    row_counts = [int(n) for n in args.rows.split(",")]
+    X_all = pipeline.transform_frame(make_upload_frame(artifacts, max(row_counts)))
+
+    for model_key in args.models.split(","):
+        model = artifacts["models"].get(model_key)
+        if model is None:
+            continue
+        start = time.perf_counter()
+        numpy_path = compile_model(model, native_min_rows=np.iinfo(np.int64).max)
+        compile_ms = (time.perf_counter() - start) * 1000
+        native_path = compile_model(model, native_min_rows=0)
+        print(f"\n{model_key} (compiled in {compile_ms:.0f} ms)")
+        print(f"{'rows':>8} {'predict_proba':>14} {'numpy trees':>12} {'native':>10}  max |diff|")
+        for n_rows in row_counts:
+            X = X_all.iloc[:n_rows]
+            expected = model.predict_proba(X)[:, 1]
+            diff = max(
+                np.abs(numpy_path.predict_proba(X)[:, 1] - expected).max(),
+                np.abs(native_path.predict_proba(X)[:, 1] - expected).max(),
+            )
+            repeats = args.repeats if n_rows < 10_000 else 1
+            timings = [
+                best_of(lambda: model.predict_proba(X), repeats),
+                best_of(lambda: numpy_path.predict_proba(X), repeats),
+                best_of(lambda: native_path.predict_proba(X), repeats),
+            ]
+            print(
+                f"{n_rows:>8} {timings[0] * 1000:11.2f} ms {timings[1] * 1000:9.2f} ms "
+                f"{timings[2] * 1000:7.2f} ms  {diff:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
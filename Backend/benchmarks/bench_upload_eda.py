@@ -0,0 +1,186 @@
+import argparse
+import math
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from eda_profile import profile_upload
+
+LEGACY_KEYS = ["summary", "missingness", "type_breakdown", "stats", "distributions", "identity_analysis", "duplicates"]
+
+
+def legacy_upload_eda(df, meta):
+    rows = int(df.shape[0])
+    cols = int(df.shape[1])
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    categorical_cols = df.select_dtypes(include="object").columns.tolist()
+    binary_cols = [col for col in df.columns if df[col].nunique(dropna=True) <= 2]
+
+    summary = {
+        "rows": rows,
+        "columns": cols,
+        "numeric_columns": int(len(numeric_cols)),
+        "categorical_columns": int(len(categorical_cols)),
+        "binary_columns": int(len(binary_cols)),
+        "transaction_id_present": "TransactionID" in df.columns,
+        "dataset_type": meta.get("dataset_type"),
+        "file_size_bytes": int(sum(f.get("size_bytes") or 0 for f in meta.get("files", []))),
+        "files": meta.get("files", []),
+    }
+
+    total_cells = rows * cols if rows and cols else 0
+    total_missing = int(df.isnull().sum().sum())
+    overall_missing_pct = (total_missing / total_cells) * 100 if total_cells else 0.0
+    rows_with_missing_pct = float(df.isnull().any(axis=1).mean() * 100) if rows else 0.0
+
+    missing_counts = df.isnull().sum().sort_values(ascending=False)
+    missingness = (
+        missing_counts.head(20)
+        .reset_index()
+        .rename(columns={"index": "feature", 0: "missing"})
+    )
+    missingness["missing_pct"] = (missingness["missing"] / rows * 100) if rows else 0.0
+
+    def cat_distribution(series, top=10):
+        counts = series.dropna().astype(str).value_counts().head(top)
+        return [{"label": idx, "value": int(val)} for idx, val in counts.items()]
+
+    distributions = {}
+    if "TransactionAmt" in df.columns:
+        transaction_amount = df["TransactionAmt"].dropna()
+        hist = transaction_amount.value_counts(bins=20).sort_index()
+        distributions["transaction_amount"] = [
+            {"label": f"{interval.left:.2f}-{interval.right:.2f}", "value": int(count)}
+            for interval, count in hist.items()
+        ]
+        log_vals = transaction_amount.apply(lambda v: math.log1p(v) if v > 0 else 0)
+        hist_log = log_vals.value_counts(bins=20).sort_index()
+        distributions["transaction_amount_log"] = [
+            {"label": f"{interval.left:.2f}-{interval.right:.2f}", "value": int(count)}
+            for interval, count in hist_log.items()
+        ]
+
+    if "TransactionDT" in df.columns:
+        numeric_dt = pd.to_numeric(df["TransactionDT"], errors="coerce")
+        hour_series = ((numeric_dt / 3600) % 24).round(0)
+        distributions["hour"] = cat_distribution(hour_series, top=24)
+    elif "hour" in df.columns:
+        distributions["hour"] = cat_distribution(df["hour"], top=24)
+
+    for col, key in [
+        ("ProductCD", "product_cd"),
+        ("DeviceType", "device_type"),
+        ("card4", "card4"),
+        ("P_emaildomain", "email_domain"),
+    ]:
+        if col in df.columns:
+            distributions[key] = cat_distribution(df[col], top=10)
+
+    def numeric_stats(series):
+        clean = series.dropna()
+        if clean.empty:
+            return None
+        q1 = clean.quantile(0.25)
+        q3 = clean.quantile(0.75)
+        iqr = q3 - q1
+        lower = q1 - 1.5 * iqr
+        upper = q3 + 1.5 * iqr
+        return {
+            "min": float(clean.min()),
+            "max": float(clean.max()),
+            "mean": float(clean.mean()),
+            "median": float(clean.median()),
+            "std": float(clean.std()),
+            "outliers": int(((clean < lower) | (clean > upper)).sum()),
+        }
+
+    stats = {}
+    for col in ["TransactionAmt", "hour", "card1", "addr1"]:
+        if col in df.columns:
+            stats[col] = numeric_stats(df[col])
+
+    id_cols = [col for col in df.columns if col.startswith("id_")]
+    identity_analysis = None
+    if id_cols:
+        id_missing = df[id_cols].isnull().sum().sum()
+        id_total = len(id_cols) * rows if rows else 0
+        rows_with_many_missing = int((df[id_cols].isnull().sum(axis=1) >= 5).sum()) if rows else 0
+        identity_analysis = {
+            "id_columns_present": len(id_cols),
+            "id_missing_percent": (id_missing / id_total) * 100 if id_total else 0.0,
+            "rows_with_many_missing_ids": rows_with_many_missing,
+        }
+
+    duplicates = None
+    if "TransactionID" in df.columns:
+        duplicates = {"transaction_id_duplicates": int(df["TransactionID"].duplicated().sum())}
+
+    return {
+        "summary": summary,
+        "missingness": {
+            "overall_missing_pct": overall_missing_pct,
+            "rows_with_missing_pct": rows_with_missing_pct,
+            "top": missingness.to_dict(orient="records"),
+        },
+        "type_breakdown": {
+            "numeric": len(numeric_cols),
+            "categorical": len(categorical_cols),
+            "binary": len(binary_cols),
+        },
+        "stats": stats,
+        "distributions": distributions,
+        "identity_analysis": identity_analysis,
+        "duplicates": duplicates,
+    }
+
+
+def add_wide_columns(df, n_columns, seed=0, missing_rate=0.3):
+    rng = np.random.default_rng(seed)
+    extra = {}
+    for i in range(n_columns):
+        values = rng.integers(0, 2, len(df)).astype(np.float64) if i % 4 == 0 else rng.normal(0, 1, len(df))
+        values[rng.random(len(df)) < missing_rate] = np.nan
+        extra[f"V{i + 1}"] = values
+    return pd.concat([df, pd.DataFrame(extra, index=df.index)], axis=1)
+
+
+def comparable(result):
+    result = {key: result[key] for key in LEGACY_KEYS}
+    result["summary"] = {key: value for key, value in result["summary"].items() if key != "upload_timestamp"}
+    return result
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy upload EDA vs single-pass profile_upload")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--extra-columns", type=int, default=100, help="synthetic V columns to widen the upload")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    df = add_wide_columns(make_upload_frame(artifacts, args.rows), args.extra_columns)
+    meta = {"dataset_type": "merged", "files": []}
+
+    legacy, legacy_time = best_of(lambda: legacy_upload_eda(df, meta), args.repeats)
+    profile, profile_time = best_of(lambda: profile_upload(df, meta), args.repeats)
+
+    print(f"rows={len(df)} columns={df.shape[1]}")
+    print(f"legacy upload_eda : {legacy_time * 1000:9.1f} ms")
+    print(f"profile_upload    : {profile_time * 1000:9.1f} ms")
+    print(f"speedup           : {legacy_time / profile_time:9.1f}x")
+    print(f"identical output  : {comparable(legacy) == comparable(profile)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from synthetic import DEFAULT_ARTIFACTS, load_benchmark_artifacts, make_upload_frame
+from bench_upload_eda import add_wide_columns
+from eda_profile import UploadSketch, profile_upload
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def sketch_csv(path, chunksize):
+    sketch = UploadSketch()
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        sketch.update(chunk)
+    return sketch
+
+
+def relative_error(exact, approx):
+    return abs(approx - exact) / max(abs(exact), 1e-12)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact upload EDA vs chunked sketches on a CSV upload")
+    parser.add_argument("--artifacts", default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--extra-columns", type=int, default=20)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    artifacts = load_benchmark_artifacts(args.artifacts)
+    df = add_wide_columns(make_upload_frame(artifacts, args.rows), args.extra_columns)
+    rng = np.random.default_rng(0)
+    duplicated = rng.random(len(df)) < args.duplicate_rate
+    df.loc[duplicated, "TransactionID"] = rng.choice(df["TransactionID"].to_numpy(), int(duplicated.sum()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "upload.csv"
+        df.to_csv(path, index=False)
+        del df
+        size_mb = path.stat().st_size / 1e6
+
+        exact, exact_time, exact_peak = measure(lambda: profile_upload(pd.read_csv(path), {}))
+        sketch, sketch_time, sketch_peak = measure(lambda: sketch_csv(path, args.chunksize))
+        approx = sketch.result({})
+
+        halves = [UploadSketch(), UploadSketch()]
+        for i, chunk in enumerate(pd.read_csv(path, chunksize=args.chunksize)):
+            halves[i % 2].update(chunk)
+        merged = halves[0].merge(halves[1]).result({})
+
+    print(f"rows={exact['summary']['rows']} columns={exact['summary']['columns']} csv={size_mb:.0f} MB")
+    print(f"exact  (read_csv + profile_upload): {exact_time:7.1f} s  peak {exact_peak / 1e6:8.1f} MB")
+    print(f"sketch (chunked UploadSketch)     : {sketch_time:7.1f} s  peak {sketch_peak / 1e6:8.1f} MB")
+
+    exact_dups = exact["duplicates"]["transaction_id_duplicates"]
+    approx_dups = approx["duplicates"]["transaction_id_duplicates"]
+    print(f"duplicates: exact {exact_dups} sketch {approx_dups} "
+          f"(distinct rel. error {relative_error(exact['summary']['rows'] - exact_dups, approx['approximation']['transaction_id_distinct']):.4f}, "
+          f"std. error {approx['approximation']['distinct_standard_error']:.4f})")
+    for col, stats in exact["stats"].items():
+        if stats is None:
+            continue
+        worst = max(relative_error(stats[key], approx["stats"][col][key]) for key in ["median", "mean", "std"])
+        print(f"stats {col:<15} worst rel. error (median/mean/std) {worst:.4f}  "
+              f"outliers {stats['outliers']} vs {approx['stats'][col]['outliers']}")
+    for key, exact_counts in exact["distributions"].items():
+        approx_counts = {item["label"]: item["value"] for item in approx["distributions"][key]}
+        total = sum(item["value"] for item in exact_counts) or 1
+        l1 = sum(abs(item["value"] - approx_counts.get(item["label"], 0)) for item in exact_counts) / total
+        print(f"distribution {key:<24} L1 / total {l1:.4f}")
+    same = all(approx[key] == merged[key] for key in ["missingness", "type_breakdown", "distributions", "duplicates"])
+    print(f"merged halves match single pass: {same}")
+
+
+if __name__ == "__main__":
+    main()
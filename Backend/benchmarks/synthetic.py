@@ -0,0 +1,75 @@
+from pathlib import Path
+import sys
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_ARTIFACTS = BACKEND_DIR / "results" / "artifacts.joblib"
+DERIVED_COLUMNS = {"hour", "TransactionAmt_log", "TransactionAmt_by_card1", "TransactionAmt_by_device"}
+
+
+def load_benchmark_artifacts(path=DEFAULT_ARTIFACTS):
+    from artifact_store import load_artifacts_from
+
+    path = Path(path)
+    if not path.exists():
+        raise SystemExit(f"Missing {path}. Run run_pipeline.py to generate artifacts.")
+    return load_artifacts_from(path)
+
+
+def make_upload_frame(artifacts, n_rows, seed=0, missing_rate=0.1, unseen_rate=0.01):
+    rng = np.random.default_rng(seed)
+    medians = artifacts.get("medians", {})
+    encoders = artifacts.get("encoders", {})
+    raw_columns = [
+        col for col in artifacts.get("feature_columns", [])
+        if col not in DERIVED_COLUMNS and not col.endswith("_missing")
+    ]
+
+    data = {"TransactionID": np.arange(3_000_000, 3_000_000 + n_rows)}
+    for col in raw_columns:
+        if col == "TransactionDT":
+            data[col] = rng.integers(86_400, 86_400 * 180, n_rows)
+        elif col == "TransactionAmt":
+            data[col] = np.round(rng.lognormal(4, 1, n_rows), 3)
+        elif col == "card1":
+            data[col] = rng.integers(1_000, 18_000, n_rows)
+        elif col in encoders:
+            classes = [c for c in encoders[col] if c != "Unknown"] or ["Unknown"]
+            values = np.array(classes, dtype=object)[rng.integers(0, len(classes), n_rows)]
+            values[rng.random(n_rows) < unseen_rate] = "unseen-value"
+            values[rng.random(n_rows) < missing_rate] = None
+            data[col] = values
+        else:
+            center = float(medians.get(col, 0.0))
+            values = center + rng.normal(0, max(abs(center), 1.0) * 0.25, n_rows)
+            values[rng.random(n_rows) < missing_rate] = np.nan
+            data[col] = values
+    return pd.DataFrame(data)
+
+
+def make_records(artifacts, n_rows, seed=0):
+    frame = make_upload_frame(artifacts, n_rows, seed=seed)
+    return [
+        {key: (None if isinstance(value, float) and np.isnan(value) else value) for key, value in row.items()}
+        for row in frame.astype(object).to_dict(orient="records")
+    ]
+
+
+def make_training_frame(artifacts, n_rows, seed=0, fraud_rate=0.1):
+    rng = np.random.default_rng(seed)
+    X = artifacts["feature_pipeline"].transform_frame(make_upload_frame(artifacts, n_rows, seed=seed))
+    weights = rng.normal(0, 1, X.shape[1])
+    score = X.to_numpy(dtype=np.float64) @ weights + rng.normal(0, X.shape[1] ** 0.5, n_rows)
+    y = pd.Series((score > np.quantile(score, 1 - fraud_rate)).astype(np.int8), name="isFraud")
+    return X, y
+
+
+def make_scores(n_rows, seed=0, fraud_rate=0.035):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n_rows) < fraud_rate).astype(np.int8)
+    scores = 1 / (1 + np.exp(-(rng.normal(0, 1, n_rows) + 2.5 * y - 2)))
+    return y, scores
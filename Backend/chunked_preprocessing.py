@@ -0,0 +1,210 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sklearn.preprocessing import StandardScaler
+
+from data_loading import DATA_DIR, CACHE_DIR, iter_csv_chunks, read_csv_compact, merge_datasets, select_columns
+from sampling import downsample_non_fraud
+from preprocessing import add_hour_feature, impute_numerical, fill_categorical, add_missing_indicators, encode_categoricals
+from feature_engineering import AMOUNT_GROUP_KEYS, add_amount_features, build_amount_table
+from scaling import scale_numeric
+
+SPILL_PATH = CACHE_DIR / "train_features.parquet"
+EXCLUDED_COLUMNS = ["TransactionID", "isFraud"]
+
+
+def iter_training_chunks(data_dir: Path = DATA_DIR, chunksize: int = 100_000, frac: float = 0.3, random_state: int = 42):
+    train_id = read_csv_compact(data_dir / "train_identity.csv", selected_only=True)
+    chunks = iter_csv_chunks(data_dir / "train_transaction.csv", chunksize, selected_only=True)
+    for i, chunk in enumerate(chunks):
+        train = select_columns(merge_datasets(chunk, train_id))
+        yield downsample_non_fraud(train, frac=frac, random_state=random_state + i)
+
+
+def merge_moments(a, b):
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+
+def array_moments(values):
+    if len(values) == 0:
+        return 0, 0.0, 0.0
+    mean = float(values.mean())
+    return len(values), mean, float(((values - mean) ** 2).sum())
+
+
+def category_strings(series):
+    return series.astype(object).fillna("Unknown").astype(str)
+
+
+class StreamingFitStats:
+    def __init__(self, sample_size: int = 100_000, random_state: int = 42):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(random_state)
+        self.template = None
+        self.numeric_cols = None
+        self.cat_cols = None
+        self.moments = {}
+        self.nulls = {}
+        self.samples = {}
+        self.vocab = {}
+        self.groups = {}
+        self.log_amount = (0, 0.0, 0.0)
+
+    def update(self, chunk: pd.DataFrame):
+        if self.template is None:
+            self.template = chunk.head(1)
+        df = add_hour_feature(chunk)
+        if self.numeric_cols is None:
+            self.numeric_cols = [
+                col for col in df.select_dtypes(include=np.number).columns if col not in EXCLUDED_COLUMNS
+            ]
+            self.cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+        for col in self.numeric_cols:
+            values = df[col].to_numpy(dtype=np.float64)
+            clean = values[~np.isnan(values)]
+            self.moments[col] = merge_moments(self.moments.get(col, (0, 0.0, 0.0)), array_moments(clean))
+            self.nulls[col] = self.nulls.get(col, 0) + len(values) - len(clean)
+            self._update_sample(col, clean)
+
+        for col in self.cat_cols:
+            counts = category_strings(df[col]).value_counts()
+            self.vocab[col] = counts if col not in self.vocab else self.vocab[col].add(counts, fill_value=0)
+
+        amount = df["TransactionAmt"].astype(np.float64)
+        self.log_amount = merge_moments(self.log_amount, array_moments(np.log1p(amount.dropna().to_numpy())))
+        for feature, key_col in AMOUNT_GROUP_KEYS.items():
+            keys = category_strings(df[key_col]) if key_col in self.cat_cols else df[key_col]
+            grouped = (
+                pd.DataFrame({"key": keys, "amount": amount, "amount_sq": amount ** 2})
+                .groupby("key")
+                .agg(count=("amount", "count"), total=("amount", "sum"), total_sq=("amount_sq", "sum"))
+            )
+            self.groups[feature] = grouped if feature not in self.groups else self.groups[feature].add(grouped, fill_value=0)
+
+    def _update_sample(self, col, values):
+        keys = self.rng.random(len(values))
+        old_keys, old_values = self.samples.get(col, (np.empty(0), np.empty(0)))
+        keys = np.concatenate([old_keys, keys])
+        values = np.concatenate([old_values, values])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[: self.sample_size]
+            keys, values = keys[keep], values[keep]
+        self.samples[col] = (keys, values)
+
+    def finalize(self):
+        medians = {
+            col: float(np.median(self.samples[col][1])) if len(self.samples[col][1]) else np.nan
+            for col in self.numeric_cols
+        }
+        encoders = {col: pd.Index(sorted(self.vocab[col].index)) for col in self.cat_cols}
+
+        first_group = self.groups[next(iter(AMOUNT_GROUP_KEYS))]
+        amount_means = {"fallback": float(first_group["total"].sum() / first_group["count"].sum())}
+        for feature, key_col in AMOUNT_GROUP_KEYS.items():
+            grouped = self.groups[feature]
+            keys = grouped.index
+            if key_col in self.cat_cols:
+                keys = encoders[key_col].get_indexer(keys)
+            amount_means[key_col] = build_amount_table(keys, (grouped["total"] / grouped["count"]).to_numpy())
+
+        fitted = {
+            "medians": medians,
+            "encoders": encoders,
+            "cat_cols": self.cat_cols,
+            "amount_means": amount_means,
+        }
+        template = transform_chunk(self.template, fitted)
+        feature_columns = [col for col in template.columns if col not in EXCLUDED_COLUMNS]
+        fitted["scaler"] = self._build_scaler(feature_columns, medians, encoders)
+        fitted["feature_columns"] = feature_columns
+        return fitted
+
+    def _feature_moments(self, col, medians, encoders):
+        if col in self.moments:
+            imputed = (self.nulls[col], medians[col], 0.0) if not np.isnan(medians[col]) else (0, 0.0, 0.0)
+            return merge_moments(self.moments[col], imputed)
+        if col in encoders:
+            counts = self.vocab[col].reindex(encoders[col]).to_numpy(dtype=np.float64)
+            codes = np.arange(len(counts), dtype=np.float64)
+            n = counts.sum()
+            mean = float((counts * codes).sum() / n) if n else 0.0
+            return int(n), mean, float((counts * (codes - mean) ** 2).sum())
+        if col.endswith("_missing"):
+            source = col[: -len("_missing")]
+            n = int(self.vocab[source].sum()) if source in self.vocab else self.moments[source][0] + self.nulls[source]
+            missing = self.nulls.get(source, 0) if source in medians and np.isnan(medians[source]) else 0
+            p = missing / n if n else 0.0
+            return n, p, p * (1 - p) * n
+        if col == "TransactionAmt_log":
+            nulls = self.nulls["TransactionAmt"]
+            return merge_moments(self.log_amount, (nulls, float(np.log1p(medians["TransactionAmt"])), 0.0))
+        if col in self.groups:
+            grouped = self.groups[col]
+            n = int(grouped["count"].sum())
+            means = grouped["total"] / grouped["count"]
+            sum_sq = float((grouped["total_sq"] / means ** 2).sum())
+            return n, 1.0, sum_sq - n
+        raise KeyError(f"No streaming statistics for feature {col}")
+
+    def _build_scaler(self, feature_columns, medians, encoders):
+        moments = [self._feature_moments(col, medians, encoders) for col in feature_columns]
+        n = np.array([m[0] for m in moments], dtype=np.float64)
+        mean = np.array([m[1] for m in moments], dtype=np.float64)
+        var = np.array([m[2] for m in moments], dtype=np.float64) / np.maximum(n, 1)
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+
+        scaler = StandardScaler()
+        scaler.mean_ = mean
+        scaler.var_ = var
+        scaler.scale_ = scale
+        scaler.n_samples_seen_ = int(n.max()) if len(n) else 0
+        scaler.n_features_in_ = len(feature_columns)
+        scaler.feature_names_in_ = np.array(feature_columns, dtype=object)
+        return scaler
+
+
+def transform_chunk(chunk, fitted, scaler=None, feature_columns=None):
+    df = add_hour_feature(chunk)
+    df, _, _ = impute_numerical(df, fitted["medians"])
+    df, cat_cols = fill_categorical(df)
+    df = add_missing_indicators(df)
+    df, _ = encode_categoricals(df, cat_cols, fitted["encoders"])
+    df, _ = add_amount_features(df, fitted["amount_means"])
+    if scaler is not None:
+        df, _ = scale_numeric(df, scaler, feature_columns=feature_columns)
+        df = df[EXCLUDED_COLUMNS + list(feature_columns)].astype({col: np.float32 for col in feature_columns})
+    return df
+
+
+def preprocess_chunked(data_dir: Path = DATA_DIR, chunksize: int = 100_000, spill_path: Path = SPILL_PATH,
+                       frac: float = 0.3, random_state: int = 42):
+    stats = StreamingFitStats(random_state=random_state)
+    for chunk in iter_training_chunks(data_dir, chunksize, frac, random_state):
+        stats.update(chunk)
+    fitted = stats.finalize()
+
+    spill_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = spill_path.with_suffix(".parquet.tmp")
+    writer = None
+    try:
+        for chunk in iter_training_chunks(data_dir, chunksize, frac, random_state):
+            transformed = transform_chunk(chunk, fitted, fitted["scaler"], fitted["feature_columns"])
+            table = pa.Table.from_pandas(transformed, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    tmp_path.replace(spill_path)
+    return spill_path, fitted
@@ -1,14 +1,125 @@
 from pathlib import Path
+import argparse
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 
 DATA_DIR = Path(__file__).resolve().parent / "datasets"
+CACHE_DIR = Path(__file__).resolve().parent / "cache"
 
+BASE_COLUMNS = [
+    "TransactionID", "TransactionDT", "TransactionAmt", "ProductCD",
+    "card1", "card2", "card3", "card4", "card5", "card6",
+    "addr1", "addr2", "P_emaildomain", "R_emaildomain",
+    "DeviceType", "DeviceInfo", "isFraud",
+]
+CATEGORICAL_COLUMNS = ["ProductCD", "card4", "card6", "P_emaildomain", "R_emaildomain", "DeviceType", "DeviceInfo"]
+INT32_COLUMNS = ["TransactionID", "TransactionDT", "card1"]
+ID_CATEGORICAL_COLUMNS = [
+    "id_12", "id_15", "id_16", "id_23", "id_27", "id_28", "id_29", "id_30",
+    "id_31", "id_33", "id_34", "id_35", "id_36", "id_37", "id_38",
+]
 
-def load_raw_data(data_dir: Path = DATA_DIR):
+
+def is_selected_column(col):
+    return col in BASE_COLUMNS or "id_" in col
+
+
+def column_dtype(col):
+    if col == "isFraud":
+        return "int8"
+    if col in INT32_COLUMNS:
+        return "int32"
+    if col in CATEGORICAL_COLUMNS or col in ID_CATEGORICAL_COLUMNS:
+        return "category"
+    if is_selected_column(col):
+        return "float32"
+    return None
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    for col in df.columns:
+        series = df[col]
+        if col == "isFraud":
+            df[col] = series.astype(np.int8)
+        elif col in INT32_COLUMNS and not series.isnull().any():
+            df[col] = series.astype(np.int32)
+        elif col in CATEGORICAL_COLUMNS or series.dtype == object:
+            df[col] = series.astype("category")
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+    return df
+
+
+def source_fingerprint(path: Path) -> dict:
+    stat = path.stat()
+    with open(path, "rb") as f:
+        head_hash = hashlib.blake2b(f.read(1 << 20), digest_size=16).hexdigest()
+    return {"source": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "head_hash": head_hash}
+
+
+def projection_report(csv_path: Path, df: pd.DataFrame, header) -> dict:
+    skipped = [col for col in header if col not in df.columns]
+    kept_bytes = int(df.memory_usage(deep=True).sum())
+    return {
+        "source": csv_path.name,
+        "parsed_columns": int(df.shape[1]),
+        "total_columns": int(len(header)),
+        "kept_mb": kept_bytes / 1e6,
+        "skipped_mb_estimate": len(skipped) * len(df) * 8 / 1e6,
+    }
+
+
+def csv_read_options(csv_path: Path, selected_only: bool = False):
+    header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+    usecols = [col for col in header if is_selected_column(col)] if selected_only else header
+    dtypes = {col: column_dtype(col) for col in usecols if column_dtype(col) is not None}
+    return header, usecols, dtypes
+
+
+def read_csv_compact(csv_path: Path, selected_only: bool = False) -> pd.DataFrame:
+    _, usecols, dtypes = csv_read_options(csv_path, selected_only)
+    return compact_dtypes(pd.read_csv(csv_path, usecols=usecols, dtype=dtypes))
+
+
+def iter_csv_chunks(csv_path: Path, chunksize: int = 100_000, selected_only: bool = False):
+    _, usecols, dtypes = csv_read_options(csv_path, selected_only)
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        yield compact_dtypes(chunk)
+
+
+def load_cached_csv(csv_path: Path, cache_dir: Path = CACHE_DIR, selected_only: bool = False) -> pd.DataFrame:
+    suffix = ".selected" if selected_only else ""
+    cache_path = cache_dir / f"{csv_path.stem}{suffix}.parquet"
+    meta_path = cache_dir / f"{csv_path.stem}{suffix}.json"
+    fingerprint = source_fingerprint(csv_path)
+
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+    if meta is not None and meta.get("fingerprint") == fingerprint and cache_path.exists():
+        return pd.read_parquet(cache_path)
+
+    df = read_csv_compact(csv_path, selected_only)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path, index=False)
+    tmp_path.replace(cache_path)
+    meta_path.write_text(json.dumps({"fingerprint": fingerprint, "columns": list(df.columns)}))
+    return df
+
+
+def load_raw_data(data_dir: Path = DATA_DIR, use_cache: bool = True, selected_only: bool = False,
+                  cache_dir: Path = CACHE_DIR):
     trans_path = data_dir / "train_transaction.csv"
     id_path = data_dir / "train_identity.csv"
-    train_trans = pd.read_csv(trans_path)
-    train_id = pd.read_csv(id_path)
+    if use_cache:
+        train_trans = load_cached_csv(trans_path, cache_dir, selected_only)
+        train_id = load_cached_csv(id_path, cache_dir, selected_only)
+        return train_trans, train_id
+    train_trans = read_csv_compact(trans_path, selected_only)
+    train_id = read_csv_compact(id_path, selected_only)
     return train_trans, train_id
 
 
@@ -17,10 +128,19 @@ def merge_datasets(train_trans: pd.DataFrame, train_id: pd.DataFrame) -> pd.Data
 
 
 def select_columns(train: pd.DataFrame) -> pd.DataFrame:
-    columns_to_keep = [
-        "TransactionID", "TransactionDT", "TransactionAmt", "ProductCD",
-        "card1", "card2", "card3", "card4", "card5", "card6",
-        "addr1", "addr2", "P_emaildomain", "R_emaildomain",
-        "DeviceType", "DeviceInfo", "isFraud",
-    ] + [col for col in train.columns if "id_" in col]
+    columns_to_keep = BASE_COLUMNS + [col for col in train.columns if "id_" in col]
     return train[columns_to_keep]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report how much of each training CSV the selected-column parse keeps")
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    args = parser.parse_args()
+    for name in ["train_transaction.csv", "train_identity.csv"]:
+        csv_path = Path(args.data_dir) / name
+        header, _, _ = csv_read_options(csv_path, selected_only=True)
+        report = projection_report(csv_path, read_csv_compact(csv_path, selected_only=True), header)
+        print(
+            f"{report['source']}: parsed {report['parsed_columns']}/{report['total_columns']} columns, "
+            f"{report['kept_mb']:.1f} MB in memory, ~{report['skipped_mb_estimate']:.1f} MB of float64 skipped"
+        )
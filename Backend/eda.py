@@ -72,7 +72,7 @@ def plot_productcd(train_sampled, save_path=None):
 
 
 def plot_email_fraud(train_sampled, save_path=None):
-    email_fraud = train_sampled.groupby("P_emaildomain")["isFraud"].mean().sort_values(ascending=False) * 100
+    email_fraud = train_sampled.groupby("P_emaildomain", observed=True)["isFraud"].mean().sort_values(ascending=False) * 100
     plt.figure(figsize=(12, 5))
     sns.barplot(x=email_fraud.index, y=email_fraud.values, palette="coolwarm")
     plt.title("Fraud Percentage by P_emaildomain")
@@ -98,7 +98,7 @@ def plot_hourly_fraud(train_sampled, save_path=None):
 
 
 def plot_device_fraud(train_sampled, save_path=None):
-    device_fraud = train_sampled.groupby("DeviceType")["isFraud"].mean() * 100
+    device_fraud = train_sampled.groupby("DeviceType", observed=True)["isFraud"].mean() * 100
     plt.figure(figsize=(6, 4))
     sns.barplot(x=device_fraud.index, y=device_fraud.values, palette="Blues")
     plt.title("Fraud Percentage by Device Type")
@@ -167,16 +167,12 @@ def build_training_eda_json(train_sampled_raw, results_dir):
 
 
 if __name__ == "__main__":
-    from data_loading import load_raw_data, merge_datasets, select_columns
-    from sampling import downsample_non_fraud
-    from preprocessing import add_hour_feature, impute_numerical
+    from pipeline_cache import training_stages
+    from preprocessing import impute_numerical
 
-    train_trans, train_id = load_raw_data()
-    train = merge_datasets(train_trans, train_id)
-    train = select_columns(train)
-
-    train_sampled_raw = downsample_non_fraud(train)
-    train_sampled_raw = add_hour_feature(train_sampled_raw)
+    stages = training_stages()
+    train, _ = stages["merged"].value()
+    train_sampled_raw, _ = stages["sampled"].value()
     train_sampled, num_cols, _ = impute_numerical(train_sampled_raw)
 
     save_all_eda_plots(train, train_sampled, num_cols)
@@ -0,0 +1,415 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from sketches import DDSketch, DistinctCounter, MisraGries, Moments, label_counts
+
+HIST_BINS = 20
+STAT_COLUMNS = ["TransactionAmt", "hour", "card1", "addr1"]
+CATEGORY_COLUMNS = [
+    ("ProductCD", "product_cd"),
+    ("DeviceType", "device_type"),
+    ("card4", "card4"),
+    ("P_emaildomain", "email_domain"),
+]
+MANY_MISSING_IDS = 5
+BINARY_PREFIX_ROWS = 4096
+
+
+def at_most_two_values(values, missing):
+    prefix = values[:BINARY_PREFIX_ROWS][~missing[:BINARY_PREFIX_ROWS]]
+    if len(pd.unique(prefix)) > 2:
+        return False
+    clean = values[~missing]
+    if len(clean) == 0:
+        return True
+    first = clean[0]
+    other = np.flatnonzero(clean != first)
+    if len(other) == 0:
+        return True
+    second = clean[other[0]]
+    return bool(((clean == first) | (clean == second)).all())
+
+
+def histogram_bins(low, high, bins=HIST_BINS):
+    categories, edges = pd.cut(np.array([low, high]), bins, include_lowest=True, retbins=True)
+    return categories.categories, edges
+
+
+def histogram_payload(intervals, counts):
+    return [
+        {"label": f"{interval.left:.2f}-{interval.right:.2f}", "value": int(round(count))}
+        for interval, count in zip(intervals, counts)
+    ]
+
+
+def histogram(values, bins=HIST_BINS):
+    if len(values) == 0:
+        return []
+    intervals, edges = histogram_bins(values.min(), values.max(), bins)
+    ids = np.searchsorted(edges, values, side="left")
+    ids[values == edges[0]] = 1
+    return histogram_payload(intervals, np.bincount(ids - 1, minlength=len(edges) - 1))
+
+
+def top_counts(values, top=10):
+    ranked = label_counts(values).sort_values(ascending=False).head(top)
+    return [{"label": label, "value": int(value)} for label, value in ranked.items()]
+
+
+def numeric_stats(values):
+    if len(values) == 0:
+        return None
+    clean = pd.Series(values)
+    q1, q3 = clean.quantile([0.25, 0.75])
+    iqr = q3 - q1
+    lower = q1 - 1.5 * iqr
+    upper = q3 + 1.5 * iqr
+    return {
+        "min": float(clean.min()),
+        "max": float(clean.max()),
+        "mean": float(clean.mean()),
+        "median": float(clean.median()),
+        "std": float(clean.std()),
+        "outliers": int(np.count_nonzero((values < lower) | (values > upper))),
+    }
+
+
+def scan_columns(df, keep=()):
+    rows = len(df)
+    row_missing = np.zeros(rows, dtype=bool)
+    id_row_missing = np.zeros(rows, dtype=np.int32)
+    missing_counts = []
+    present = {}
+    binary_cols = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        missing = np.isnan(values) if values.dtype.kind == "f" else pd.isna(values)
+        count = int(np.count_nonzero(missing))
+        missing_counts.append(count)
+        if count:
+            row_missing |= missing
+            if col.startswith("id_"):
+                id_row_missing += missing
+        if at_most_two_values(values, missing):
+            binary_cols.append(col)
+        if col in keep:
+            present[col] = values[~missing] if count else values
+    return {
+        "missing_counts": pd.Series(missing_counts, index=df.columns, dtype=np.int64),
+        "rows_with_missing": int(np.count_nonzero(row_missing)),
+        "rows_with_many_missing_ids": int(np.count_nonzero(id_row_missing >= MANY_MISSING_IDS)),
+        "present": present,
+        "binary_cols": binary_cols,
+    }
+
+
+def log_amounts(amounts):
+    positive = amounts > 0
+    logged = np.zeros(len(amounts))
+    logged[positive] = np.log1p(amounts[positive])
+    return logged
+
+
+def transaction_hours(transaction_dt):
+    numeric_dt = pd.to_numeric(transaction_dt, errors="coerce").to_numpy(dtype=np.float64)
+    hours = np.round((numeric_dt / 3600) % 24, 0)
+    return hours[~np.isnan(hours)]
+
+
+def assemble_profile(meta, parts, schema_alignment=None, approximation=None):
+    rows = parts["rows"]
+    columns = parts["columns"]
+    cols = len(columns)
+    missing_counts = parts["missing_counts"]
+    summary = {
+        "rows": rows,
+        "columns": cols,
+        "numeric_columns": int(len(parts["numeric_cols"])),
+        "categorical_columns": int(len(parts["categorical_cols"])),
+        "binary_columns": int(len(parts["binary_cols"])),
+        "transaction_id_present": "TransactionID" in columns,
+        "dataset_type": meta.get("dataset_type"),
+        "upload_timestamp": datetime.utcnow().isoformat(),
+        "file_size_bytes": int(sum(f.get("size_bytes") or 0 for f in meta.get("files", []))),
+        "files": meta.get("files", []),
+    }
+
+    total_cells = rows * cols if rows and cols else 0
+    total_missing = int(missing_counts.sum())
+    overall_missing_pct = (total_missing / total_cells) * 100 if total_cells else 0.0
+    rows_with_missing_pct = parts["rows_with_missing"] / rows * 100 if rows else 0.0
+    top_missing = [
+        {"feature": feature, "missing": int(missing), "missing_pct": float(missing / rows * 100) if rows else 0.0}
+        for feature, missing in missing_counts.sort_values(ascending=False).head(20).items()
+    ]
+
+    id_cols = [col for col in columns if col.startswith("id_")]
+    identity_analysis = None
+    if id_cols:
+        id_missing = int(missing_counts[id_cols].sum())
+        id_total = len(id_cols) * rows if rows else 0
+        identity_analysis = {
+            "id_columns_present": len(id_cols),
+            "id_missing_percent": (id_missing / id_total) * 100 if id_total else 0.0,
+            "rows_with_many_missing_ids": parts["rows_with_many_missing_ids"] if rows else 0,
+        }
+
+    warnings = []
+    if identity_analysis and identity_analysis["id_missing_percent"] > 30:
+        warnings.append("Identity features are heavily missing; risk signals may be weaker.")
+    if overall_missing_pct > 20:
+        warnings.append("High overall missingness detected; results may be less reliable.")
+    if "TransactionDT" not in columns:
+        warnings.append("TransactionDT missing; hour feature may be imputed or unavailable.")
+
+    return {
+        "summary": summary,
+        "missingness": {
+            "overall_missing_pct": overall_missing_pct,
+            "rows_with_missing_pct": rows_with_missing_pct,
+            "top": top_missing,
+        },
+        "type_breakdown": {
+            "numeric": len(parts["numeric_cols"]),
+            "categorical": len(parts["categorical_cols"]),
+            "binary": len(parts["binary_cols"]),
+        },
+        "stats": parts["stats"],
+        "distributions": parts["distributions"],
+        "identity_analysis": identity_analysis,
+        "schema_alignment": schema_alignment,
+        "duplicates": parts["duplicates"],
+        "warnings": warnings,
+        "approximation": approximation,
+    }
+
+
+def profile_upload(df, meta, schema_alignment=None):
+    schema = df.iloc[:0]
+    scan = scan_columns(df, keep={"TransactionAmt", "hour", *STAT_COLUMNS, *(col for col, _ in CATEGORY_COLUMNS)})
+    present = scan["present"]
+
+    distributions = {}
+    if "TransactionAmt" in df.columns:
+        for key, amounts in [
+            ("transaction_amount", present["TransactionAmt"]),
+            ("transaction_amount_log", log_amounts(present["TransactionAmt"])),
+        ]:
+            distributions[key] = histogram(amounts)
+
+    if "TransactionDT" in df.columns:
+        distributions["hour"] = top_counts(transaction_hours(df["TransactionDT"]), top=24)
+    elif "hour" in df.columns:
+        distributions["hour"] = top_counts(present["hour"], top=24)
+
+    for col, key in CATEGORY_COLUMNS:
+        if col in df.columns:
+            distributions[key] = top_counts(present[col], top=10)
+
+    stats = {}
+    for col in STAT_COLUMNS:
+        if col in df.columns:
+            stats[col] = numeric_stats(present[col])
+
+    duplicates = None
+    if "TransactionID" in df.columns:
+        duplicates = {"transaction_id_duplicates": int(df["TransactionID"].duplicated().sum())}
+
+    return assemble_profile(meta, {
+        "rows": int(df.shape[0]),
+        "columns": df.columns.tolist(),
+        "numeric_cols": schema.select_dtypes(include="number").columns.tolist(),
+        "categorical_cols": schema.select_dtypes(include="object").columns.tolist(),
+        "binary_cols": scan["binary_cols"],
+        "missing_counts": scan["missing_counts"],
+        "rows_with_missing": scan["rows_with_missing"],
+        "rows_with_many_missing_ids": scan["rows_with_many_missing_ids"],
+        "stats": stats,
+        "distributions": distributions,
+        "duplicates": duplicates,
+    }, schema_alignment)
+
+
+class UploadSketch:
+    def __init__(self, relative_accuracy: float = 0.01, hll_precision: int = 16, top_capacity: int = 4096):
+        self.relative_accuracy = relative_accuracy
+        self.hll_precision = hll_precision
+        self.top_capacity = top_capacity
+        self.chunks = 0
+        self.rows = 0
+        self.columns = []
+        self.numeric = {}
+        self.categorical = set()
+        self.missing = {}
+        self.small_values = {}
+        self.rows_with_missing = 0
+        self.rows_with_many_missing_ids = 0
+        self.quantiles = {}
+        self.moments = {}
+        self.log_amounts = None
+        self.top = {}
+        self.transaction_ids = None
+
+    def quantile_sketch(self):
+        return DDSketch(self.relative_accuracy)
+
+    def top_sketch(self, key):
+        return self.top.setdefault(key, MisraGries(self.top_capacity))
+
+    def update(self, chunk):
+        self.chunks += 1
+        self.rows += len(chunk)
+        row_missing = np.zeros(len(chunk), dtype=bool)
+        id_row_missing = np.zeros(len(chunk), dtype=np.int32)
+        numeric = set(chunk.iloc[:0].select_dtypes(include="number").columns)
+        for col in chunk.columns:
+            if col not in self.missing:
+                self.columns.append(col)
+                self.missing[col] = 0
+                self.numeric[col] = True
+                self.small_values[col] = set()
+            values = chunk[col].to_numpy()
+            missing = np.isnan(values) if values.dtype.kind == "f" else pd.isna(values)
+            count = int(np.count_nonzero(missing))
+            self.missing[col] += count
+            self.numeric[col] = self.numeric[col] and col in numeric
+            if values.dtype == object:
+                self.categorical.add(col)
+            if count:
+                row_missing |= missing
+                if col.startswith("id_"):
+                    id_row_missing += missing
+            if self.small_values[col] is not None:
+                if at_most_two_values(values, missing):
+                    self.small_values[col].update(pd.unique(values[~missing]).tolist())
+                else:
+                    self.small_values[col] = None
+            if self.small_values[col] is not None and len(self.small_values[col]) > 2:
+                self.small_values[col] = None
+        self.rows_with_missing += int(np.count_nonzero(row_missing))
+        self.rows_with_many_missing_ids += int(np.count_nonzero(id_row_missing >= MANY_MISSING_IDS))
+
+        for col in STAT_COLUMNS:
+            if col in chunk.columns:
+                values = pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64)
+                self.quantiles.setdefault(col, self.quantile_sketch()).update(values)
+                self.moments.setdefault(col, Moments()).update(values)
+        if "TransactionAmt" in chunk.columns:
+            amounts = pd.to_numeric(chunk["TransactionAmt"], errors="coerce").to_numpy(dtype=np.float64)
+            if self.log_amounts is None:
+                self.log_amounts = self.quantile_sketch()
+            self.log_amounts.update(log_amounts(amounts[~np.isnan(amounts)]))
+        if "TransactionDT" in chunk.columns:
+            self.top_sketch("hour").update(transaction_hours(chunk["TransactionDT"]))
+        elif "hour" in chunk.columns:
+            self.top_sketch("hour").update(chunk["hour"].dropna().to_numpy())
+        for col, key in CATEGORY_COLUMNS:
+            if col in chunk.columns:
+                self.top_sketch(key).update(chunk[col].dropna().to_numpy())
+        if "TransactionID" in chunk.columns:
+            if self.transaction_ids is None:
+                self.transaction_ids = DistinctCounter(self.hll_precision)
+            self.transaction_ids.update(chunk["TransactionID"].to_numpy())
+        return self
+
+    def merge(self, other):
+        self.chunks += other.chunks
+        self.rows += other.rows
+        for col in other.columns:
+            if col not in self.missing:
+                self.columns.append(col)
+                self.missing[col] = 0
+                self.numeric[col] = True
+                self.small_values[col] = set()
+            self.missing[col] += other.missing[col]
+            self.numeric[col] = self.numeric[col] and other.numeric[col]
+            if self.small_values[col] is None or other.small_values[col] is None:
+                self.small_values[col] = None
+            elif len(self.small_values[col] | other.small_values[col]) > 2:
+                self.small_values[col] = None
+            else:
+                self.small_values[col] |= other.small_values[col]
+        self.categorical |= other.categorical
+        self.rows_with_missing += other.rows_with_missing
+        self.rows_with_many_missing_ids += other.rows_with_many_missing_ids
+        for mine, theirs, factory in [
+            (self.quantiles, other.quantiles, self.quantile_sketch),
+            (self.moments, other.moments, Moments),
+            (self.top, other.top, lambda: MisraGries(self.top_capacity)),
+        ]:
+            for key, sketch in theirs.items():
+                mine.setdefault(key, factory()).merge(sketch)
+        if other.log_amounts is not None:
+            if self.log_amounts is None:
+                self.log_amounts = self.quantile_sketch()
+            self.log_amounts.merge(other.log_amounts)
+        if other.transaction_ids is not None:
+            if self.transaction_ids is None:
+                self.transaction_ids = DistinctCounter(self.hll_precision)
+            self.transaction_ids.merge(other.transaction_ids)
+        return self
+
+    def numeric_stats(self, col):
+        sketch = self.quantiles[col]
+        if sketch.count == 0:
+            return None
+        q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        moments = self.moments[col]
+        return {
+            "min": float(sketch.min),
+            "max": float(sketch.max),
+            "mean": float(moments.mean),
+            "median": float(median),
+            "std": float(moments.std()),
+            "outliers": sketch.count_outside(q1 - 1.5 * iqr, q3 + 1.5 * iqr),
+        }
+
+    def sketch_histogram(self, sketch):
+        if sketch is None or sketch.count == 0:
+            return []
+        intervals, edges = histogram_bins(sketch.min, sketch.max)
+        return histogram_payload(intervals, sketch.histogram(edges))
+
+    def result(self, meta, schema_alignment=None):
+        distributions = {}
+        if "TransactionAmt" in self.quantiles:
+            distributions["transaction_amount"] = self.sketch_histogram(self.quantiles["TransactionAmt"])
+            distributions["transaction_amount_log"] = self.sketch_histogram(self.log_amounts)
+        if "hour" in self.top:
+            distributions["hour"] = self.top["hour"].top(24)
+        for _, key in CATEGORY_COLUMNS:
+            if key in self.top:
+                distributions[key] = self.top[key].top(10)
+
+        duplicates = None
+        distinct_ids = None
+        duplicates_error = None
+        if self.transaction_ids is not None:
+            distinct_ids = min(self.transaction_ids.count(), self.rows)
+            duplicates_error = int(round(2 * distinct_ids * self.transaction_ids.standard_error))
+            duplicate_count = self.rows - distinct_ids
+            duplicates = {"transaction_id_duplicates": duplicate_count if duplicate_count > duplicates_error else 0}
+
+        return assemble_profile(meta, {
+            "rows": self.rows,
+            "columns": self.columns,
+            "numeric_cols": [col for col in self.columns if self.numeric[col] and col not in self.categorical],
+            "categorical_cols": [col for col in self.columns if col in self.categorical],
+            "binary_cols": [col for col in self.columns if self.small_values[col] is not None],
+            "missing_counts": pd.Series([self.missing[col] for col in self.columns], index=self.columns, dtype=np.int64),
+            "rows_with_missing": self.rows_with_missing,
+            "rows_with_many_missing_ids": self.rows_with_many_missing_ids,
+            "stats": {col: self.numeric_stats(col) for col in STAT_COLUMNS if col in self.quantiles},
+            "distributions": distributions,
+            "duplicates": duplicates,
+        }, schema_alignment, {
+            "method": "sketch",
+            "chunks": self.chunks,
+            "quantile_relative_error": self.relative_accuracy,
+            "distinct_standard_error": self.transaction_ids.standard_error if self.transaction_ids else None,
+            "transaction_id_distinct": distinct_ids,
+            "transaction_id_duplicates_error": duplicates_error,
+            "category_count_error": {key: int(sketch.error) for key, sketch in self.top.items()},
+        })
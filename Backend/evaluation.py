@@ -52,25 +52,46 @@ def plot_roc_curve(y_true, y_pred_proba, save_path=None):
     plt.close()
 
 
-def plot_precision_recall_thresholds(y_true, y_pred_proba, threshold, save_path=None):
-    thresholds = np.linspace(0, 1, 100)
-    recalls = []
-    precisions = []
+def ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
 
-    for t in thresholds:
-        preds = (y_pred_proba > t).astype(int)
-        cm = confusion_matrix(y_true, preds)
-        tp = cm[1, 1]
-        fp = cm[0, 1]
-        fn = cm[1, 0]
-        precision_score = tp / (tp + fp + 1e-6)
-        recall_score = tp / (tp + fn + 1e-6)
-        recalls.append(recall_score)
-        precisions.append(precision_score)
+
+def threshold_sweep(y_true, y_score, thresholds=None, fp_cost=1.0, fn_cost=1.0):
+    positive = np.asarray(y_true).astype(bool)
+    scores = np.asarray(y_score, dtype=np.float64)
+    thresholds = np.linspace(0, 1, 101) if thresholds is None else np.asarray(thresholds, dtype=np.float64)
+    positive_scores = np.sort(scores[positive])
+    negative_scores = np.sort(scores[~positive])
+
+    fn = np.searchsorted(positive_scores, thresholds, side="right")
+    tn = np.searchsorted(negative_scores, thresholds, side="right")
+    tp = len(positive_scores) - fn
+    fp = len(negative_scores) - tn
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": ratio(tp, tp + fp),
+        "recall": ratio(tp, tp + fn),
+        "f1": ratio(2 * tp, 2 * tp + fp + fn),
+        "fpr": ratio(fp, fp + tn),
+        "cost": (fp_cost * fp + fn_cost * fn) / max(len(positive), 1),
+    })
+
+
+def select_threshold(sweep, metric="f1"):
+    best = sweep[metric].idxmin() if metric == "cost" else sweep[metric].idxmax()
+    return {key: float(value) for key, value in sweep.loc[best].items()}
+
+
+def plot_precision_recall_thresholds(y_true, y_pred_proba, threshold, save_path=None):
+    sweep = threshold_sweep(y_true, y_pred_proba, np.linspace(0, 1, 100))
 
     plt.figure(figsize=(8, 5))
-    plt.plot(thresholds, recalls, label="Recall", color="red")
-    plt.plot(thresholds, precisions, label="Precision", color="blue")
+    plt.plot(sweep["threshold"], sweep["recall"], label="Recall", color="red")
+    plt.plot(sweep["threshold"], sweep["precision"], label="Precision", color="blue")
     plt.axvline(threshold, color="green", linestyle="--", label=f"Selected Threshold = {threshold}")
     plt.xlabel("Threshold")
     plt.ylabel("Performance")
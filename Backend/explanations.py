@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from catboost import Pool
+
+MAX_CATEGORIES = 5
+SIMPLE_FIELDS = [
+    ("Transaction Amount", "TransactionAmt", "Amount"),
+    ("Card Type", "card4", "Card profile"),
+    ("Device Type", "DeviceType", "Device"),
+    ("Device Info", "DeviceInfo", "Device"),
+    ("Email Domain", "P_emaildomain", "Email domain"),
+    ("Address", "addr1", "Address"),
+    ("Hour", "hour", "Time"),
+]
+
+
+def categorize(feature):
+    if feature.startswith("card"):
+        return "Card profile"
+    if feature.startswith("addr"):
+        return "Address"
+    if feature in {"P_emaildomain", "R_emaildomain"}:
+        return "Email domain"
+    if feature in {"DeviceType", "DeviceInfo"}:
+        return "Device"
+    if feature in {"TransactionAmt", "TransactionAmt_log", "TransactionAmt_by_card1", "TransactionAmt_by_device"}:
+        return "Amount"
+    if feature in {"TransactionDT", "hour"}:
+        return "Time"
+    if feature.startswith("id_"):
+        return "Identity"
+    return "Other"
+
+
+def category_matrix(feature_columns):
+    categories, positions = np.unique([categorize(f) for f in feature_columns], return_inverse=True)
+    first_seen = np.full(len(categories), len(feature_columns))
+    np.minimum.at(first_seen, positions, np.arange(len(feature_columns)))
+    order = np.argsort(first_seen, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    onehot = np.zeros((len(feature_columns), len(categories)))
+    onehot[np.arange(len(feature_columns)), rank[positions]] = 1.0
+    return [str(c) for c in categories[order]], onehot
+
+
+def importance_weights(feature_columns, importance_map):
+    weights = [importance_map.get(feature) for feature in feature_columns]
+    return np.array([1.0 if w is None else float(w) for w in weights], dtype=np.float64)
+
+
+def contribution_matrix(features, feature_columns, importance_map):
+    values = np.nan_to_num(np.asarray(features, dtype=np.float64), nan=0.0)
+    return values * importance_weights(feature_columns, importance_map)
+
+
+def supports_native_contributions(model):
+    return hasattr(model, "get_booster") or hasattr(model, "get_feature_importance")
+
+
+def native_contributions(model, features, feature_columns):
+    if hasattr(model, "get_booster"):
+        dmatrix = xgb.DMatrix(features, feature_names=list(feature_columns))
+        contributions = model.get_booster().predict(dmatrix, pred_contribs=True)
+    elif hasattr(model, "get_feature_importance"):
+        contributions = model.get_feature_importance(Pool(features), type="ShapValues")
+    else:
+        return None
+    return np.asarray(contributions, dtype=np.float64)[:, :-1]
+
+
+def resolve_positions(row_ids, n_rows):
+    positions = pd.to_numeric(pd.Series(row_ids, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(positions) & (positions == np.floor(positions)) & (positions >= 0) & (positions < n_rows)
+    return np.flatnonzero(valid), positions[valid].astype(np.int64)
+
+
+def top_k(contributions, k, largest=True):
+    k = max(0, min(k, contributions.shape[1]))
+    if k == 0:
+        return np.empty((len(contributions), 0), dtype=np.int64), np.empty((len(contributions), 0))
+    signed = contributions if largest else -contributions
+    keyed = np.where(signed > 0, signed, -np.inf)
+    idx = np.argsort(-keyed, axis=1, kind="stable")[:, :k]
+    keys = np.take_along_axis(keyed, idx, axis=1)
+    return idx, np.where(np.isfinite(keys), np.take_along_axis(contributions, idx, axis=1), np.nan)
+
+
+def category_breakdowns(contributions, feature_columns):
+    categories, onehot = category_matrix(feature_columns)
+    scores = np.abs(contributions) @ onehot
+    totals = scores.sum(axis=1, keepdims=True)
+    percentages = np.divide(scores, totals, out=np.zeros_like(scores), where=totals > 0) * 100
+    cat_index = np.broadcast_to(np.arange(len(categories)), scores.shape)
+    order = np.lexsort((cat_index, -scores), axis=1)[:, :MAX_CATEGORIES]
+    return categories, order, np.take_along_axis(percentages, order, axis=1)
+
+
+def normalize_column(values):
+    values = np.asarray(values)
+    normalized = values.tolist()
+    for i in np.flatnonzero(pd.isna(values)).tolist():
+        normalized[i] = None
+    return normalized
+
+
+def feature_items(names, values):
+    return [{"feature": name, "value": value} for name, value in zip(names, values) if value == value]
+
+
+def explain_rows(contributions, feature_columns, row_ids, top_k_count, raw, proba, pred_label):
+    names = np.asarray(feature_columns, dtype=object)
+    pos_idx, pos_values = top_k(contributions, top_k_count, largest=True)
+    neg_idx, neg_values = top_k(contributions, top_k_count, largest=False)
+    pos_names, pos_values = names[pos_idx].tolist(), pos_values.tolist()
+    neg_names, neg_values = names[neg_idx].tolist(), neg_values.tolist()
+    categories, cat_order, cat_pct = category_breakdowns(contributions, feature_columns)
+    cat_names, cat_pct = np.asarray(categories, dtype=object)[cat_order].tolist(), cat_pct.tolist()
+    raw_rows = {col: normalize_column(values) for col, values in raw.items()}
+    missing = [None] * len(row_ids)
+    fields = [(label, raw_rows.get(col, missing), category) for label, col, category in SIMPLE_FIELDS]
+    proba = np.asarray(proba, dtype=np.float64).tolist()
+    pred_label = np.asarray(pred_label).astype(int).tolist()
+
+    explanations = []
+    for i, row_id in enumerate(row_ids):
+        pct_by_category = dict(zip(cat_names[i], cat_pct[i]))
+        explanations.append({
+            "row_id": row_id,
+            "proba": proba[i],
+            "pred_label": pred_label[i],
+            "positives": feature_items(pos_names[i], pos_values[i]),
+            "negatives": feature_items(neg_names[i], neg_values[i]),
+            "category_breakdown": [
+                {"category": name, "percentage": pct} for name, pct in zip(cat_names[i], cat_pct[i])
+            ],
+            "simple_fields": [
+                {"label": label, "value": values[i], "percentage": pct_by_category.get(category, 0.0)}
+                for label, values, category in fields
+            ],
+        })
+    return explanations
@@ -1,9 +1,44 @@
 import numpy as np
 
+AMOUNT_GROUP_KEYS = {"TransactionAmt_by_card1": "card1", "TransactionAmt_by_device": "DeviceInfo"}
 
-def add_amount_features(df):
+
+def build_amount_table(keys, means):
+    keys = np.asarray(keys, dtype=np.float64)
+    means = np.asarray(means, dtype=np.float64)
+    integral = np.isfinite(keys) & (keys == np.floor(keys))
+    keys, means = keys[integral], means[integral]
+    if len(keys) == 0:
+        return {"offset": 0, "means": np.empty(0)}
+    offset = int(keys.min())
+    table = np.full(int(keys.max()) - offset + 1, np.nan)
+    table[keys.astype(np.int64) - offset] = means
+    return {"offset": offset, "means": table}
+
+
+def fit_amount_means(df):
+    amount_means = {"fallback": float(df["TransactionAmt"].mean())}
+    for key_col in AMOUNT_GROUP_KEYS.values():
+        means = df.groupby(key_col)["TransactionAmt"].mean()
+        amount_means[key_col] = build_amount_table(means.index, means.to_numpy())
+    return amount_means
+
+
+def lookup_amount_means(keys, table, fallback):
+    keys = np.asarray(keys, dtype=np.float64)
+    positions = keys - table["offset"]
+    valid = (positions >= 0) & (positions < len(table["means"])) & (positions == np.floor(positions))
+    result = np.full(len(keys), fallback, dtype=np.float64)
+    found = table["means"][positions[valid].astype(np.int64)]
+    result[valid] = np.where(np.isnan(found), fallback, found)
+    return result
+
+
+def add_amount_features(df, amount_means=None):
     df = df.copy()
+    amount_means_out = fit_amount_means(df) if amount_means is None else amount_means
     df["TransactionAmt_log"] = np.log1p(df["TransactionAmt"])
-    df["TransactionAmt_by_card1"] = df["TransactionAmt"] / df.groupby("card1")["TransactionAmt"].transform("mean")
-    df["TransactionAmt_by_device"] = df["TransactionAmt"] / df.groupby("DeviceInfo")["TransactionAmt"].transform("mean")
-    return df
+    for feature, key_col in AMOUNT_GROUP_KEYS.items():
+        means = lookup_amount_means(df[key_col], amount_means_out[key_col], amount_means_out["fallback"])
+        df[feature] = df["TransactionAmt"] / means
+    return df, amount_means_out
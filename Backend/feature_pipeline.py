@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+from feature_engineering import lookup_amount_means
+from preprocessing import category_index
+
+
+def to_float_array(raw):
+    if raw.dtype.kind in "biuf":
+        return raw.astype(np.float64, copy=False)
+    try:
+        return raw.astype(np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(raw, copy=False), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def category_codes(raw, encoder):
+    inverse, uniques = pd.factorize(raw)
+    labels = np.asarray(uniques, dtype=object).astype(str)
+    return inverse, labels, encoder.get_indexer(labels)
+
+
+def unseen_categories(raw, encoder):
+    _, labels, lookup = category_codes(raw, encoder)
+    return set(labels[lookup < 0].tolist())
+
+
+def encode_categories(raw, encoder):
+    inverse, _, lookup = category_codes(raw, encoder)
+    unknown = encoder.get_indexer(["Unknown"])[0]
+    return np.append(lookup, unknown)[inverse].astype(np.float64)
+
+
+def encode_values(raw, code_map):
+    unknown = code_map.get("Unknown", -1)
+    return np.fromiter(
+        (unknown if value is None or value != value else code_map.get(str(value), -1) for value in raw),
+        dtype=np.float64,
+        count=len(raw),
+    )
+
+
+def group_mean(keys, values):
+    result = np.full(len(keys), np.nan)
+    valid = ~np.isnan(keys)
+    uniques, inverse = np.unique(keys[valid], return_inverse=True)
+    sums = np.bincount(inverse, weights=values[valid], minlength=len(uniques))
+    counts = np.bincount(inverse, minlength=len(uniques))
+    result[valid] = (sums / counts)[inverse]
+    return result
+
+
+class FeaturePipeline:
+    def __init__(self, feature_columns, cat_cols, medians, encoders, scaler, amount_means=None):
+        self.feature_columns = list(feature_columns)
+        self.cat_cols = list(cat_cols)
+        self.medians = {col: float(value) for col, value in medians.items()}
+        self.encoders = {col: category_index(classes) for col, classes in encoders.items()}
+        self.code_maps = self._build_code_maps()
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.amount_means = amount_means
+
+    def _build_code_maps(self):
+        return {col: {cls: idx for idx, cls in enumerate(encoder)} for col, encoder in self.encoders.items()}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("code_maps", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.code_maps = self._build_code_maps()
+
+    @classmethod
+    def from_artifacts(cls, artifacts):
+        return cls(
+            artifacts.get("feature_columns", []),
+            artifacts.get("cat_cols", []),
+            artifacts.get("medians", {}),
+            artifacts.get("encoders", {}),
+            artifacts.get("scaler"),
+            artifacts.get("amount_means"),
+        )
+
+    def unseen_categories(self, df: pd.DataFrame) -> dict:
+        return {
+            col: unseen_categories(df[col].to_numpy(), encoder)
+            for col, encoder in self.encoders.items()
+            if col in df.columns
+        }
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        columns = set(df.columns)
+        return self._transform(lambda col: df[col].to_numpy() if col in columns else None, len(df))
+
+    def transform_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(self.transform(df), columns=self.feature_columns, copy=False)
+
+    def transform_records(self, records) -> np.ndarray:
+        present = set().union(*records) if records else set()
+
+        def column(col):
+            if col not in present:
+                return None
+            return np.array([record.get(col) for record in records], dtype=object)
+
+        def encode(col, raw):
+            return encode_values(raw, self.code_maps.get(col, {}))
+
+        return self._transform(column, len(records), encode)
+
+    def _transform(self, column, n, encode=None):
+        out = np.empty((n, len(self.feature_columns)), dtype=np.float32, order="F")
+        numeric_cache = {}
+        code_cache = {}
+
+        def numeric(col):
+            if col not in numeric_cache:
+                raw = column(col)
+                if raw is None:
+                    numeric_cache[col] = None
+                else:
+                    values = to_float_array(raw)
+                    missing = np.isnan(values)
+                    if missing.any():
+                        fill = self.medians.get(col)
+                        if fill is None:
+                            fill = np.nanmedian(values) if not missing.all() else np.nan
+                        values = np.where(missing, fill, values)
+                    numeric_cache[col] = values
+            return numeric_cache[col]
+
+        def codes(col):
+            if col not in code_cache:
+                raw = column(col)
+                if raw is None:
+                    code_cache[col] = None
+                elif encode is not None:
+                    code_cache[col] = encode(col, raw)
+                else:
+                    code_cache[col] = encode_categories(raw, self.encoders.get(col, pd.Index([])))
+            return code_cache[col]
+
+        def amount():
+            values = numeric("TransactionAmt")
+            return values if values is not None else np.full(n, self.medians.get("TransactionAmt", 0.0))
+
+        def amount_ratio(key_col, keys):
+            keys = keys if keys is not None else np.zeros(n)
+            if self.amount_means is None:
+                return amount() / group_mean(keys, amount())
+            means = lookup_amount_means(keys, self.amount_means[key_col], self.amount_means["fallback"])
+            return amount() / means
+
+        for j, col in enumerate(self.feature_columns):
+            if col in self.encoders:
+                values = codes(col)
+                if values is None:
+                    values = 0.0
+            elif col == "hour":
+                raw = column("TransactionDT")
+                if raw is None:
+                    values = self.medians.get("hour", 0.0)
+                else:
+                    values = np.floor((to_float_array(raw) / 3600) % 24)
+                    values = np.where(np.isnan(values), self.medians.get("hour", np.nan), values)
+            elif col.endswith("_missing"):
+                source = col[: -len("_missing")]
+                raw = column(source)
+                if raw is None or source in self.encoders or not np.isnan(self.medians.get(source, 0.0)):
+                    values = 0.0
+                else:
+                    values = np.isnan(to_float_array(raw)).astype(np.float64)
+            elif col == "TransactionAmt_log":
+                values = np.log1p(amount())
+            elif col == "TransactionAmt_by_card1":
+                values = amount_ratio("card1", numeric("card1"))
+            elif col == "TransactionAmt_by_device":
+                values = amount_ratio("DeviceInfo", codes("DeviceInfo"))
+            else:
+                values = numeric(col)
+                if values is None:
+                    values = 0.0
+            out[:, j] = (values - self.mean[j]) / self.scale[j]
+        return out
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+import pandas as pd
+from werkzeug.datastructures import FileStorage
+
+
+class Job:
+    def __init__(self, job_id, kind, work_dir: Path):
+        self.job_id = job_id
+        self.kind = kind
+        self.work_dir = work_dir
+        self.status = "queued"
+        self.progress = 0.0
+        self.summary = {}
+        self.result = None
+        self.error = None
+        self.parts = []
+        self.rows = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def report(self, progress=None, **summary):
+        with self.lock:
+            if progress is not None:
+                self.progress = min(max(float(progress), 0.0), 1.0)
+            self.summary.update(summary)
+
+    def add_part(self, frame: pd.DataFrame):
+        path = self.work_dir / f"part-{len(self.parts):05d}.parquet"
+        frame.to_parquet(path, index=False)
+        with self.lock:
+            self.parts.append((path, len(frame)))
+            self.rows += len(frame)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": self.progress,
+                "rows": self.rows,
+                "summary": dict(self.summary),
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+    def page(self, offset: int, limit: int):
+        with self.lock:
+            parts = list(self.parts)
+        frames = []
+        start = 0
+        for path, rows in parts:
+            end = start + rows
+            if end > offset and start < offset + limit:
+                frame = pd.read_parquet(path)
+                frames.append(frame.iloc[max(offset - start, 0):offset + limit - start])
+            start = end
+        if not frames:
+            return []
+        page = pd.concat(frames, ignore_index=True)
+        return page.astype(object).where(page.notna(), None).to_dict(orient="records")
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 1, max_pending: int = 8, ttl_seconds: float = 3600, work_dir=None):
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.work_dir = Path(work_dir) if work_dir else Path(tempfile.gettempdir()) / "fraud-jobs"
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, kind, files, fn, **params):
+        self._sweep()
+        with self.lock:
+            pending = sum(job.status in {"queued", "running"} for job in self.jobs.values())
+            if pending >= self.max_pending:
+                raise RuntimeError(f"Too many pending jobs ({pending}); try again later.")
+            job = Job(uuid.uuid4().hex, kind, self.work_dir / uuid.uuid4().hex)
+            self.jobs[job.job_id] = job
+
+        saved = {}
+        try:
+            job.work_dir.mkdir(parents=True, exist_ok=True)
+            for field, file_obj in files.items():
+                if file_obj is None:
+                    continue
+                path = job.work_dir / f"{field}.csv"
+                file_obj.save(path)
+                saved[field] = (path, file_obj.filename)
+        except Exception:
+            with self.lock:
+                self.jobs.pop(job.job_id, None)
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+            raise
+        self.executor.submit(self._run, job, fn, saved, params)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job, fn, saved, params):
+        with job.lock:
+            job.status = "running"
+            job.started_at = time.time()
+        handles = {field: open(path, "rb") for field, (path, _) in saved.items()}
+        try:
+            files = {
+                field: FileStorage(stream=handles[field], filename=filename)
+                for field, (_, filename) in saved.items()
+            }
+            result = fn(job, files, **params)
+            with job.lock:
+                job.result = result
+                job.status = "succeeded"
+                job.progress = 1.0
+        except Exception as exc:
+            traceback.print_exc()
+            with job.lock:
+                job.status = "failed"
+                job.error = str(exc)
+        finally:
+            for handle in handles.values():
+                handle.close()
+            for path, _ in saved.values():
+                path.unlink(missing_ok=True)
+            with job.lock:
+                job.finished_at = time.time()
+
+    def _sweep(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self.lock:
+            expired = [
+                job for job in self.jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self.jobs[job.job_id]
+        for job in expired:
+            shutil.rmtree(job.work_dir, ignore_errors=True)
@@ -0,0 +1,170 @@
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+import shutil
+import threading
+import time
+import traceback
+import uuid
+
+from artifact_store import ARTIFACT_STORE_DIRNAME, is_artifact_store, load_artifacts_from
+
+REGISTRY_DIRNAME = "registry"
+ACTIVE_FILE = "active.json"
+BUNDLE_FILES = ["artifacts.joblib", "metrics.json"]
+LEGACY_VERSION = "legacy"
+
+
+def new_version():
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def registry_dir(results_dir):
+    return Path(results_dir) / REGISTRY_DIRNAME
+
+
+def link_or_copy(src: Path, dst: Path):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def replace_file(path, write):
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    write(tmp_path)
+    tmp_path.replace(path)
+
+
+def activate_version(results_dir, version):
+    registry = registry_dir(results_dir)
+    if not (registry / version).is_dir():
+        raise FileNotFoundError(f"Unknown model version: {version}")
+    tmp_path = registry / f".{ACTIVE_FILE}.{uuid.uuid4().hex}"
+    tmp_path.write_text(json.dumps({"version": version, "activated_at": datetime.utcnow().isoformat()}))
+    tmp_path.replace(registry / ACTIVE_FILE)
+
+
+def publish_version(results_dir, version=None):
+    results_dir = Path(results_dir)
+    version = version or new_version()
+    registry = registry_dir(results_dir)
+    staging = registry / f".{version}.tmp"
+    staging.mkdir(parents=True)
+    for name in BUNDLE_FILES:
+        if (results_dir / name).exists():
+            link_or_copy(results_dir / name, staging / name)
+    store = results_dir / ARTIFACT_STORE_DIRNAME
+    if is_artifact_store(store):
+        (staging / ARTIFACT_STORE_DIRNAME).mkdir()
+        for path in store.iterdir():
+            link_or_copy(path, staging / ARTIFACT_STORE_DIRNAME / path.name)
+    staging.rename(registry / version)
+    activate_version(results_dir, version)
+    return version
+
+
+def read_active_version(results_dir):
+    path = registry_dir(results_dir) / ACTIVE_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text()).get("version")
+
+
+def list_versions(results_dir):
+    registry = registry_dir(results_dir)
+    if not registry.exists():
+        return []
+    return sorted(p.name for p in registry.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+
+def load_bundle(version, bundle_dir: Path, mmap: bool = False):
+    artifacts_path = bundle_dir / ARTIFACT_STORE_DIRNAME
+    if not is_artifact_store(artifacts_path):
+        artifacts_path = bundle_dir / "artifacts.joblib"
+    if not artifacts_path.exists():
+        raise FileNotFoundError("Missing artifacts.joblib. Run run_pipeline.py to generate artifacts.")
+    metrics_path = bundle_dir / "metrics.json"
+    return {
+        "version": version,
+        "artifacts_path": artifacts_path,
+        "artifacts": load_artifacts_from(artifacts_path, mmap=mmap),
+        "metrics": json.loads(metrics_path.read_text()) if metrics_path.exists() else None,
+        "loaded_at": datetime.utcnow().isoformat(),
+    }
+
+
+class ModelRegistry:
+    def __init__(self, results_dir, warm_fn=None, poll_seconds: float = 5.0, mmap: bool = False):
+        self.results_dir = Path(results_dir)
+        self.warm_fn = warm_fn
+        self.poll_seconds = poll_seconds
+        self.mmap = mmap
+        self.current = None
+        self.active_stamp = None
+        self.lock = threading.Lock()
+        self.watcher = None
+
+    def get(self, warm: bool = True):
+        if self.current is None:
+            with self.lock:
+                if self.current is None:
+                    self.current = self._load_active(warm=warm)
+        if warm and not self.current.get("warmed"):
+            with self.lock:
+                self._warm(self.current)
+        return self.current
+
+    def check(self):
+        if self.current is None or self._stamp() == self.active_stamp:
+            return False
+        with self.lock:
+            stamp = self._stamp()
+            if stamp == self.active_stamp:
+                return False
+            try:
+                bundle = self._load_active()
+            except Exception:
+                traceback.print_exc()
+                self.active_stamp = stamp
+                return False
+            previous, self.current = self.current, bundle
+        print(f"Model registry: switched from {previous['version']} to {bundle['version']}")
+        return True
+
+    def start_watcher(self):
+        if self.poll_seconds <= 0 or (self.watcher is not None and self.watcher.is_alive()):
+            return
+        self.watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self.watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            self.check()
+
+    def _stamp(self):
+        try:
+            stat = (registry_dir(self.results_dir) / ACTIVE_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _warm(self, bundle):
+        if not bundle.get("warmed") and self.warm_fn is not None:
+            self.warm_fn(bundle)
+        bundle["warmed"] = True
+
+    def _load_active(self, warm: bool = True):
+        stamp = self._stamp()
+        version = read_active_version(self.results_dir) if stamp is not None else None
+        if version is None:
+            bundle = load_bundle(LEGACY_VERSION, self.results_dir, mmap=self.mmap)
+        else:
+            bundle = load_bundle(version, registry_dir(self.results_dir) / version, mmap=self.mmap)
+        if warm:
+            self._warm(bundle)
+        self.active_stamp = stamp
+        return bundle
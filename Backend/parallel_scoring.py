@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import multiprocessing as mp
+import os
+import numpy as np
+from catboost import CatBoost
+
+from artifact_store import load_artifacts_from
+from feature_pipeline import FeaturePipeline
+from stacking import StackedEnsemble
+
+WORKER_STATE = {}
+
+
+class CatBoostThreads:
+    def __init__(self, model, threads):
+        self.model = model
+        self.threads = threads
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X, thread_count=self.threads)
+
+
+def limit_model_threads(model, threads):
+    if hasattr(model, "estimators_"):
+        model = StackedEnsemble.from_stacking_classifier(model)
+    if isinstance(model, StackedEnsemble):
+        return model.with_base_models(
+            {name: limit_model_threads(base, threads) for name, base in model.base_models.items()}
+        )
+    if isinstance(model, CatBoost):
+        return CatBoostThreads(model, threads)
+    if hasattr(model, "get_booster"):
+        model.set_params(n_jobs=threads)
+    return model
+
+
+def init_worker(artifacts_path, threads):
+    artifacts = load_artifacts_from(artifacts_path)
+    WORKER_STATE["pipeline"] = artifacts.get("feature_pipeline") or FeaturePipeline.from_artifacts(artifacts)
+    WORKER_STATE["models"] = artifacts.get("models", {})
+    WORKER_STATE["threads"] = threads
+    WORKER_STATE["limited"] = {}
+
+
+def score_shard(model_key, shard):
+    limited = WORKER_STATE["limited"]
+    if model_key not in limited:
+        limited[model_key] = limit_model_threads(WORKER_STATE["models"][model_key], WORKER_STATE["threads"])
+    model = limited[model_key]
+    X = WORKER_STATE["pipeline"].transform_frame(shard)
+    proba = model.predict_proba(X)[:, 1]
+    return X.to_numpy(), proba
+
+
+def default_start_method():
+    return "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+
+class ParallelScorer:
+    def __init__(self, artifacts_path, workers: int = None, shard_rows: int = 20_000,
+                 start_method: str = None, threads_per_worker: int = 1):
+        self.artifacts_path = Path(artifacts_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_rows = shard_rows
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context(start_method or default_start_method()),
+            initializer=init_worker,
+            initargs=(str(self.artifacts_path), threads_per_worker),
+        )
+
+    def score(self, model_key, df):
+        shards = [df.iloc[start:start + self.shard_rows] for start in range(0, len(df), self.shard_rows)]
+        results = [future.result() for future in [self.executor.submit(score_shard, model_key, s) for s in shards]]
+        if not results:
+            return np.empty((0, 0), dtype=np.float32), np.empty(0)
+        return np.vstack([X for X, _ in results]), np.concatenate([proba for _, proba in results])
+
+    def predict_proba(self, model_key, df):
+        return self.score(model_key, df)[1]
+
+    def warm_up(self):
+        futures = [self.executor.submit(os.getpid) for _ in range(self.workers)]
+        return sorted({future.result() for future in futures})
+
+    def close(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
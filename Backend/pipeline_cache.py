@@ -0,0 +1,149 @@
+from pathlib import Path
+import hashlib
+import inspect
+import json
+import time
+import uuid
+import joblib
+import pandas as pd
+
+import data_loading
+import feature_engineering
+import preprocessing
+import sampling
+import scaling
+from data_loading import CACHE_DIR, DATA_DIR, load_raw_data, merge_datasets, select_columns, source_fingerprint
+from sampling import downsample_non_fraud
+from preprocessing import (
+    add_hour_feature,
+    impute_numerical,
+    fill_categorical,
+    add_missing_indicators,
+    encode_categoricals,
+)
+from feature_engineering import add_amount_features
+from scaling import scale_numeric
+
+STAGE_CACHE_DIR = CACHE_DIR / "stages"
+SOURCE_FILES = ["train_transaction.csv", "train_identity.csv"]
+
+
+def code_fingerprint(functions):
+    hasher = hashlib.blake2b(digest_size=16)
+    for fn in functions:
+        hasher.update(inspect.getsource(fn).encode())
+    return hasher.hexdigest()
+
+
+class Stage:
+    def __init__(self, cache, name, fn, inputs=(), params=None, code=(), extra=None):
+        self.cache = cache
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.params = params or {}
+        payload = {
+            "name": name,
+            "params": self.params,
+            "extra": extra,
+            "inputs": [stage.key for stage in self.inputs],
+            "code": code_fingerprint([fn, *code]),
+        }
+        digest = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=16)
+        self.key = f"{name}-{digest.hexdigest()}"
+        self.result = None
+
+    def value(self):
+        if self.result is None:
+            start = time.perf_counter()
+            self.result = self.cache.load(self.key)
+            if self.result is None:
+                self.result = self.fn(*[stage.value() for stage in self.inputs], **self.params)
+                self.cache.save(self.key, self.result)
+                print(f"Stage {self.name}: computed in {time.perf_counter() - start:.1f} s")
+            else:
+                print(f"Stage {self.name}: loaded from cache in {time.perf_counter() - start:.1f} s")
+        return self.result
+
+
+class StageCache:
+    def __init__(self, directory=STAGE_CACHE_DIR, enabled: bool = True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+
+    def stage(self, name, fn, inputs=(), params=None, code=(), extra=None):
+        return Stage(self, name, fn, inputs, params, code, extra)
+
+    def load(self, key):
+        frame_path = self.directory / f"{key}.parquet"
+        if not self.enabled or not frame_path.exists():
+            return None
+        state_path = self.directory / f"{key}.joblib"
+        state = joblib.load(state_path) if state_path.exists() else None
+        return pd.read_parquet(frame_path), state
+
+    def save(self, key, result):
+        if not self.enabled:
+            return
+        frame, state = result
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if state is not None:
+            tmp_state = self.directory / f".{key}.{uuid.uuid4().hex}.joblib"
+            joblib.dump(state, tmp_state)
+            tmp_state.replace(self.directory / f"{key}.joblib")
+        tmp_frame = self.directory / f".{key}.{uuid.uuid4().hex}.parquet"
+        frame.to_parquet(tmp_frame)
+        tmp_frame.replace(self.directory / f"{key}.parquet")
+
+
+def load_merged(data_dir, selected_only):
+    train_trans, train_id = load_raw_data(Path(data_dir), selected_only=selected_only)
+    return select_columns(merge_datasets(train_trans, train_id)), None
+
+
+def sample_training(merged, frac, random_state):
+    train, _ = merged
+    return add_hour_feature(downsample_non_fraud(train, frac=frac, random_state=random_state)), None
+
+
+def build_features(sampled):
+    df, _ = sampled
+    df, _, medians = impute_numerical(df)
+    df, cat_cols = fill_categorical(df)
+    df = add_missing_indicators(df)
+    df, encoders = encode_categoricals(df, cat_cols)
+    df, amount_means = add_amount_features(df)
+    df, scaler = scale_numeric(df)
+    return df, {
+        "medians": medians,
+        "cat_cols": cat_cols,
+        "encoders": encoders,
+        "amount_means": amount_means,
+        "scaler": scaler,
+    }
+
+
+def training_stages(cache: StageCache = None, data_dir: Path = DATA_DIR, frac: float = 0.3, random_state: int = 42):
+    cache = cache or StageCache()
+    data_dir = Path(data_dir)
+    merged = cache.stage(
+        "merged",
+        load_merged,
+        params={"data_dir": str(data_dir), "selected_only": True},
+        code=[data_loading],
+        extra=[source_fingerprint(data_dir / name) for name in SOURCE_FILES],
+    )
+    sampled = cache.stage(
+        "sampled",
+        sample_training,
+        inputs=[merged],
+        params={"frac": frac, "random_state": random_state},
+        code=[sampling, preprocessing],
+    )
+    features = cache.stage(
+        "features",
+        build_features,
+        inputs=[sampled],
+        code=[preprocessing, feature_engineering, scaling],
+    )
+    return {"merged": merged, "sampled": sampled, "features": features}
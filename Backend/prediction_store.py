@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from pathlib import Path
+import threading
+import time
+import uuid
+import joblib
+import numpy as np
+
+EXPLAIN_RAW_COLUMNS = ["TransactionAmt", "card4", "DeviceType", "DeviceInfo", "P_emaildomain", "addr1", "hour"]
+OBJECT_ITEM_BYTES = 64
+
+
+def entry_nbytes(entry):
+    total = 0
+    for value in entry.values():
+        if isinstance(value, dict):
+            total += entry_nbytes(value)
+        elif isinstance(value, np.ndarray):
+            total += value.size * OBJECT_ITEM_BYTES if value.dtype == object else value.nbytes
+    return total
+
+
+def compact_raw_columns(df, columns=EXPLAIN_RAW_COLUMNS):
+    raw = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy()
+        if values.dtype.kind in "biuf":
+            raw[col] = values.astype(np.float64, copy=False)
+        else:
+            raw[col] = values.astype(object)
+    return raw
+
+
+class PredictionStore:
+    def __init__(self, max_entries: int = 32, ttl_seconds: float = 1800, max_bytes: int = 512 * 1024 * 1024,
+                 spill_dir=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def put(self, entry: dict) -> str:
+        prediction_id = uuid.uuid4().hex
+        entry = {**entry, "prediction_id": prediction_id, "created_at": time.time()}
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.spill_dir / f"{prediction_id}.joblib.tmp"
+            joblib.dump(entry, tmp_path)
+            tmp_path.replace(self.spill_dir / f"{prediction_id}.joblib")
+        with self.lock:
+            self._insert(prediction_id, entry)
+            self._evict()
+        if self.spill_dir is not None:
+            self._sweep_spill_dir()
+        return prediction_id
+
+    def get(self, prediction_id):
+        if not prediction_id:
+            return None
+        with self.lock:
+            entry = self.entries.get(prediction_id)
+            if entry is not None:
+                if self._expired(entry):
+                    self._remove(prediction_id)
+                    return None
+                self.entries.move_to_end(prediction_id)
+                return entry
+        entry = self._load_spilled(prediction_id)
+        if entry is None:
+            return None
+        with self.lock:
+            self._insert(prediction_id, entry)
+            self._evict()
+        return entry
+
+    def update(self, prediction_id, key, value):
+        with self.lock:
+            entry = self.entries.get(prediction_id)
+            if entry is None:
+                return
+            entry[key] = value
+            self.total_bytes -= self.sizes[prediction_id]
+            self.sizes[prediction_id] = entry_nbytes(entry)
+            self.total_bytes += self.sizes[prediction_id]
+            self._evict()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _expired(self, entry):
+        return time.time() - entry["created_at"] > self.ttl_seconds
+
+    def _insert(self, prediction_id, entry):
+        if prediction_id in self.entries:
+            self._remove(prediction_id)
+        self.entries[prediction_id] = entry
+        self.sizes[prediction_id] = entry_nbytes(entry)
+        self.total_bytes += self.sizes[prediction_id]
+
+    def _remove(self, prediction_id):
+        self.entries.pop(prediction_id, None)
+        self.total_bytes -= self.sizes.pop(prediction_id, 0)
+
+    def _evict(self):
+        for prediction_id in [pid for pid, entry in self.entries.items() if self._expired(entry)]:
+            self._remove(prediction_id)
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self.entries)))
+
+    def _load_spilled(self, prediction_id):
+        if self.spill_dir is None or not prediction_id.isalnum():
+            return None
+        path = self.spill_dir / f"{prediction_id}.joblib"
+        if not path.exists():
+            return None
+        entry = joblib.load(path)
+        if self._expired(entry):
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _sweep_spill_dir(self):
+        cutoff = time.time() - self.ttl_seconds
+        for path in self.spill_dir.glob("*.joblib"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
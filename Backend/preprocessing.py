@@ -1,5 +1,5 @@
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
+import pandas as pd
 
 
 def add_hour_feature(df):
@@ -24,7 +24,10 @@ def impute_numerical(df, medians=None):
 
 def fill_categorical(df):
     df = df.copy()
-    cat_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    for col in cat_cols:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and "Unknown" not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories("Unknown")
     df[cat_cols] = df[cat_cols].fillna("Unknown")
     return df, cat_cols
 
@@ -37,16 +40,19 @@ def add_missing_indicators(df):
     return df
 
 
+def category_index(classes):
+    return classes if isinstance(classes, pd.Index) else pd.Index(classes)
+
+
 def encode_categoricals(df, cat_cols, encoders=None):
-    df = df.copy()
+    df = df.copy(deep=False)
     encoders_out = {} if encoders is None else encoders
     for col in cat_cols:
         if encoders is None:
-            le = LabelEncoder()
-            df[col] = le.fit_transform(df[col].astype(str))
-            encoders_out[col] = list(le.classes_)
+            codes, classes = pd.factorize(df[col].astype(str), sort=True)
+            df[col] = codes.astype(np.int32)
+            encoders_out[col] = pd.Index(classes)
         else:
-            classes = encoders_out.get(col, [])
-            mapping = {cls: idx for idx, cls in enumerate(classes)}
-            df[col] = df[col].astype(str).map(mapping).fillna(-1).astype(int)
+            classes = category_index(encoders_out.get(col, []))
+            df[col] = classes.get_indexer(df[col].astype(str)).astype(np.int32)
     return df, encoders_out
@@ -1,7 +1,10 @@
 from pathlib import Path
+import argparse
 import json
+import shutil
 from datetime import datetime
 import joblib
+import pandas as pd
 from sklearn.metrics import (
     confusion_matrix,
     roc_curve,
@@ -9,48 +12,54 @@ from sklearn.metrics import (
     precision_recall_fscore_support,
     average_precision_score,
 )
-from data_loading import load_raw_data, merge_datasets, select_columns
-from sampling import downsample_non_fraud
-from preprocessing import (
-    add_hour_feature,
-    impute_numerical,
-    fill_categorical,
-    add_missing_indicators,
-    encode_categoricals,
-)
-from feature_engineering import add_amount_features
-from scaling import scale_numeric
+from pipeline_cache import StageCache, training_stages
+from chunked_preprocessing import preprocess_chunked
+from feature_pipeline import FeaturePipeline
 from splitting import random_stratified_split
-from models import train_xgboost, train_catboost, train_stacking
+from training import FitCache, train_models
+from model_registry import publish_version, replace_file
+from artifact_store import ARTIFACT_STORE_DIRNAME, save_artifact_store
 from evaluation import (
     classification_metrics,
     plot_confusion_matrices,
     plot_roc_curve,
     plot_precision_recall_thresholds,
     plot_feature_importance_xgb,
+    select_threshold,
+    threshold_sweep,
 )
 
 
-def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
-    train_trans, train_id = load_raw_data()
-    train = merge_datasets(train_trans, train_id)
-    train = select_columns(train)
-
-    train_sampled = downsample_non_fraud(train)
-    train_sampled = add_hour_feature(train_sampled)
-
-    train_sampled, _, medians = impute_numerical(train_sampled)
-    train_sampled, cat_cols = fill_categorical(train_sampled)
-    train_sampled = add_missing_indicators(train_sampled)
-    train_sampled, encoders = encode_categoricals(train_sampled, cat_cols)
-
-    train_sampled = add_amount_features(train_sampled)
-    train_sampled, scaler = scale_numeric(train_sampled)
+def run_pipeline(
+    threshold=0.3,
+    run_plots=False,
+    results_dir=None,
+    chunked=False,
+    chunksize=100_000,
+    train_workers=None,
+    fit_cache=True,
+    stage_cache=True,
+):
+    if chunked:
+        spill_path, fitted = preprocess_chunked(chunksize=chunksize)
+        train_sampled = pd.read_parquet(spill_path)
+        medians = fitted["medians"]
+        cat_cols = fitted["cat_cols"]
+        encoders = fitted["encoders"]
+        scaler = fitted["scaler"]
+        amount_means = fitted["amount_means"]
+    else:
+        train_sampled, fitted = training_stages(StageCache(enabled=stage_cache))["features"].value()
+        medians = fitted["medians"]
+        cat_cols = fitted["cat_cols"]
+        encoders = fitted["encoders"]
+        scaler = fitted["scaler"]
+        amount_means = fitted["amount_means"]
 
     X_train, X_test, y_train, y_test = random_stratified_split(train_sampled)
 
-    xgb = train_xgboost(X_train, y_train)
-    cat = train_catboost(X_train, y_train)
+    models, stack_model = train_models(X_train, y_train, workers=train_workers, cache=FitCache(enabled=fit_cache))
+    xgb, cat = models["xgb"], models["cat"]
 
     y_pred_xgb = xgb.predict(X_test)
     y_pred_xgb_proba = xgb.predict_proba(X_test)[:, 1]
@@ -62,9 +71,7 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
     metrics_cat = classification_metrics(y_test, y_pred_cat, y_pred_cat_proba)
 
     metrics_stack = None
-    stack_model = None
     try:
-        stack_model = train_stacking(xgb, cat, X_train, y_train)
         y_pred_proba = stack_model.predict_proba(X_test)[:, 1]
         y_pred = (y_pred_proba > threshold).astype(int)
         metrics_stack = classification_metrics(y_test, y_pred, y_pred_proba)
@@ -103,9 +110,13 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
         "encoders": encoders,
         "medians": medians,
         "cat_cols": cat_cols,
+        "amount_means": amount_means,
         "feature_columns": list(X_train.columns),
+        "feature_pipeline": FeaturePipeline(X_train.columns, cat_cols, medians, encoders, scaler, amount_means),
     }
-    joblib.dump(artifacts, results_path / "artifacts.joblib")
+    replace_file(results_path / "artifacts.joblib", lambda path: joblib.dump(artifacts, path))
+    shutil.rmtree(results_path / ARTIFACT_STORE_DIRNAME, ignore_errors=True)
+    save_artifact_store(artifacts, results_path / ARTIFACT_STORE_DIRNAME)
 
     def metrics_payload(name, y_true, preds, proba, model_obj):
         tn, fp, fn, tp = confusion_matrix(y_true, preds).ravel()
@@ -126,6 +137,7 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
             y_true, preds, average="binary"
         )
         pr_auc = float(average_precision_score(y_true, proba))
+        sweep = threshold_sweep(y_true, proba)
         return {
             "metrics": {
                 "roc_auc": float(metric_obj["roc_auc"]),
@@ -137,7 +149,11 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
             "curves": {
                 "roc": {"fpr": roc[0].tolist(), "tpr": roc[1].tolist()},
                 "pr": {"precision": pr[0].tolist(), "recall": pr[1].tolist()},
+                "thresholds": {
+                    key: sweep[key].tolist() for key in ["threshold", "precision", "recall", "f1", "fpr", "cost"]
+                },
             },
+            "operating_points": {metric: select_threshold(sweep, metric) for metric in ["f1", "cost"]},
             "confusion_matrix": {"tn": int(tn), "fp": int(fp), "fn": int(fn), "tp": int(tp)},
             "feature_importance": feature_importance,
         }
@@ -164,8 +180,9 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
         model_key: {**payload, "training_stats": training_stats}
         for model_key, payload in metrics_bundle.items()
     }
-    with open(results_path / "metrics.json", "w") as f:
-        json.dump(metrics_payloads, f)
+    replace_file(results_path / "metrics.json", lambda path: path.write_text(json.dumps(metrics_payloads)))
+    version = publish_version(results_path)
+    print(f"Published model version {version}")
 
     return {
         "xgb": metrics_xgb,
@@ -175,7 +192,21 @@ def run_pipeline(threshold=0.3, run_plots=False, results_dir=None):
 
 
 if __name__ == "__main__":
-    results = run_pipeline(run_plots=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunked", action="store_true", help="Fit and transform in bounded-memory chunks")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--train-workers", type=int, default=None, help="Concurrent model fits (default: CPU count)")
+    parser.add_argument("--no-fit-cache", action="store_true", help="Refit every model instead of reusing cache/fits")
+    parser.add_argument("--no-stage-cache", action="store_true", help="Recompute preprocessing instead of cache/stages")
+    args = parser.parse_args()
+    results = run_pipeline(
+        run_plots=True,
+        chunked=args.chunked,
+        chunksize=args.chunksize,
+        train_workers=args.train_workers,
+        fit_cache=not args.no_fit_cache,
+        stage_cache=not args.no_stage_cache,
+    )
     for name, metrics in results.items():
         if metrics is None:
             print(f"{name.upper()} skipped")
@@ -0,0 +1,50 @@
+import argparse
+import os
+import threading
+from gunicorn.app.base import BaseApplication
+
+import api_app
+
+
+class ApiServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        api_app.preload()
+        return api_app.app
+
+
+def start_worker(server, worker):
+    api_app.get_registry().start_watcher()
+    threading.Thread(target=api_app.warm_up, name="warm-up", daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the fraud detection API with gunicorn")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "5000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", "2")))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("WEB_THREADS", "4")))
+    parser.add_argument("--timeout", type=int, default=int(os.environ.get("WEB_TIMEOUT", "300")))
+    args = parser.parse_args()
+
+    ApiServer({
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "timeout": args.timeout,
+        "preload_app": True,
+        "accesslog": "-",
+        "post_fork": start_worker,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import math
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "iufb":
+        values = values.astype(np.float64) + 0.0
+    return pd.util.hash_array(values)
+
+
+def label_counts(values):
+    values = np.asarray(values)
+    codes, uniques = pd.factorize(values)
+    if values.dtype == object and not all(isinstance(value, str) for value in uniques):
+        codes, uniques = pd.factorize(pd.Series(values).astype(str).to_numpy())
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return pd.Series(counts, index=pd.Series(uniques).astype(str).to_numpy(), dtype=np.int64)
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def standard_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values):
+        hashes = hash_values(values)
+        if len(hashes) == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision + 1 - np.frexp(rest.astype(np.float64))[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.stores = {1: (0, np.zeros(0, dtype=np.int64)), -1: (0, np.zeros(0, dtype=np.int64))}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def bucket(self, magnitude):
+        return np.ceil(np.log(magnitude) / self.log_gamma).astype(np.int64)
+
+    def bucket_value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add_to_store(self, sign, index, counts):
+        offset, store = self.stores[sign]
+        if len(index) == 0:
+            return
+        low = min(int(index.min()), offset) if len(store) else int(index.min())
+        high = max(int(index.max()), offset + len(store) - 1) if len(store) else int(index.max())
+        grown = np.zeros(high - low + 1, dtype=np.int64)
+        grown[offset - low:offset - low + len(store)] = store
+        np.add.at(grown, index - low, counts)
+        self.stores[sign] = (low, grown)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        magnitude = np.abs(values)
+        zero = magnitude < self.min_value
+        self.zero_count += int(np.count_nonzero(zero))
+        for sign, mask in [(1, (values > 0) & ~zero), (-1, (values < 0) & ~zero)]:
+            index, counts = np.unique(self.bucket(magnitude[mask]), return_counts=True)
+            self.add_to_store(sign, index, counts)
+        return self
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge DDSketches with different accuracy")
+        for sign, (offset, store) in other.stores.items():
+            nonzero = np.flatnonzero(store)
+            self.add_to_store(sign, nonzero + offset, store[nonzero])
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def buckets(self):
+        neg_offset, neg = self.stores[-1]
+        pos_offset, pos = self.stores[1]
+        neg_index = np.arange(neg_offset, neg_offset + len(neg))[::-1]
+        pos_index = np.arange(pos_offset, pos_offset + len(pos))
+        lower = np.concatenate([-self.gamma ** neg_index, [0.0], self.gamma ** (pos_index - 1)])
+        upper = np.concatenate([-self.gamma ** (neg_index - 1), [0.0], self.gamma ** pos_index])
+        values = np.concatenate([-self.bucket_value(neg_index), [0.0], self.bucket_value(pos_index)])
+        counts = np.concatenate([neg[::-1], [self.zero_count], pos])
+        keep = counts > 0
+        return (
+            np.clip(values[keep], self.min, self.max),
+            np.clip(lower[keep], self.min, self.max),
+            np.clip(upper[keep], self.min, self.max),
+            counts[keep],
+        )
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return [None for _ in qs]
+        values, _, _, counts = self.buckets()
+        cumulative = np.cumsum(counts)
+        ranks = np.asarray(qs, dtype=np.float64) * (self.count - 1)
+        return values[np.searchsorted(cumulative, ranks, side="right")].tolist()
+
+    def rank(self, points):
+        _, lower, upper, counts = self.buckets()
+        points = np.asarray(points, dtype=np.float64)[:, None]
+        width = upper - lower
+        share = np.where(width > 0, (points - lower) / np.where(width > 0, width, 1.0), points >= upper)
+        return np.clip(share, 0.0, 1.0) @ counts
+
+    def count_outside(self, lower, upper):
+        below, above = self.rank([lower, upper])
+        return int(round(below + self.count - above))
+
+    def histogram(self, edges):
+        cumulative = self.rank(edges)
+        cumulative[0] = 0.0
+        cumulative[-1] = self.count
+        return np.diff(cumulative)
+
+
+class MisraGries:
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.counts = {}
+        self.error = 0
+
+    def update(self, values):
+        counts = label_counts(values)
+        return self.add(zip(counts.index, counts.tolist()))
+
+    def add(self, items):
+        for label, count in items:
+            self.counts[label] = self.counts.get(label, 0) + count
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {label: count - cut for label, count in self.counts.items() if count > cut}
+            self.error += cut
+        return self
+
+    def merge(self, other):
+        self.error += other.error
+        return self.add(other.counts.items())
+
+    def top(self, top=10):
+        ranked = pd.Series(self.counts, dtype=np.int64).sort_values(ascending=False).head(top)
+        return [{"label": label, "value": int(value), "error": int(self.error)} for label, value in ranked.items()]
+
+
+class IdBitmap:
+    def __init__(self, max_bits: int = 1 << 28):
+        self.max_bits = max_bits
+        self.offset = 0
+        self.bits = np.zeros(0, dtype=np.uint8)
+        self.missing = 0
+
+    def grow(self, low, high):
+        if len(self.bits):
+            low, high = min(low, self.offset), max(high, self.offset + 8 * len(self.bits) - 1)
+        low -= low % 8
+        if high - low + 1 > self.max_bits:
+            return False
+        grown = np.zeros((high - low) // 8 + 1, dtype=np.uint8)
+        start = (self.offset - low) // 8
+        grown[start:start + len(self.bits)] = self.bits
+        self.offset, self.bits = low, grown
+        return True
+
+    def update(self, values):
+        values = np.asarray(values)
+        missing = 0
+        if values.dtype.kind == "f":
+            nan = np.isnan(values)
+            missing = int(np.count_nonzero(nan))
+            values = values[~nan]
+            if not np.array_equal(values, np.floor(values)):
+                return False
+        elif values.dtype.kind not in "iu":
+            return False
+        values = values.astype(np.int64)
+        if len(values) and not self.grow(int(values.min()), int(values.max())):
+            return False
+        self.missing += missing
+        positions = values - self.offset
+        np.bitwise_or.at(self.bits, positions >> 3, np.left_shift(1, positions & 7).astype(np.uint8))
+        return True
+
+    def merge(self, other):
+        if len(other.bits) and not self.grow(other.offset, other.offset + 8 * len(other.bits) - 1):
+            return False
+        start = (other.offset - self.offset) // 8
+        self.bits[start:start + len(other.bits)] |= other.bits
+        self.missing += other.missing
+        return True
+
+    def ids(self):
+        ids = np.flatnonzero(np.unpackbits(self.bits, bitorder="little")).astype(np.float64) + self.offset
+        return np.append(ids, np.nan) if self.missing else ids
+
+    def count(self):
+        return int(np.bitwise_count(self.bits).sum()) + (1 if self.missing else 0)
+
+
+class DistinctCounter:
+    def __init__(self, precision: int = 14, max_bits: int = 1 << 28):
+        self.bitmap = IdBitmap(max_bits)
+        self.hll = HyperLogLog(precision)
+
+    @property
+    def exact(self):
+        return self.bitmap is not None
+
+    @property
+    def standard_error(self):
+        return 0.0 if self.exact else self.hll.standard_error
+
+    def fall_back(self):
+        self.hll.update(self.bitmap.ids())
+        self.bitmap = None
+
+    def update(self, values):
+        if self.exact and not self.bitmap.update(values):
+            self.fall_back()
+        if not self.exact:
+            self.hll.update(values)
+        return self
+
+    def merge(self, other):
+        if self.exact and other.exact and self.bitmap.merge(other.bitmap):
+            return self
+        if self.exact:
+            self.fall_back()
+        self.hll.merge(other.hll)
+        if other.exact:
+            self.hll.update(other.bitmap.ids())
+        return self
+
+    def count(self):
+        return self.bitmap.count() if self.exact else self.hll.count()
+
+
+class Moments:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        other = Moments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        return self.merge(other)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
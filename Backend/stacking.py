@@ -0,0 +1,122 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import numpy as np
+
+
+def sigmoid(margin):
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+def proba_columns(p1):
+    return np.column_stack([1.0 - p1, p1])
+
+
+class ProbaCache:
+    def __init__(self, max_entries: int = 16, min_rows: int = 1000):
+        self.max_entries = max_entries
+        self.min_rows = min_rows
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, X):
+        if self.max_entries <= 0 or len(X) < self.min_rows:
+            return None
+        data = np.ascontiguousarray(np.asarray(X))
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{data.dtype.str}{data.shape}".encode())
+        hasher.update(data.view(np.uint8).ravel())
+        return hasher.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            proba = self.entries.get(key)
+            if proba is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return proba
+
+    def put(self, key, proba):
+        with self.lock:
+            self.entries[key] = proba
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+class CachedScorer:
+    def __init__(self, model, cache_key, cache: ProbaCache):
+        self.model = model
+        self.cache_key = cache_key
+        self.cache = cache
+
+    def proba(self, X, digest=None):
+        if digest is None:
+            return self.model.predict_proba(X)[:, 1]
+        key = (self.cache_key, digest)
+        proba = self.cache.get(key)
+        if proba is None:
+            proba = self.model.predict_proba(X)[:, 1]
+            proba.setflags(write=False)
+            self.cache.put(key, proba)
+        return proba
+
+    def predict_proba(self, X):
+        return proba_columns(self.proba(X, self.cache.digest(X)))
+
+
+def positive_proba(model, X, digest=None):
+    if isinstance(model, CachedScorer):
+        return model.proba(X, digest)
+    return model.predict_proba(X)[:, 1]
+
+
+class StackedEnsemble:
+    def __init__(self, base_models, coef, intercept, passthrough: bool = True, cache: ProbaCache = None):
+        self.base_models = dict(base_models)
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.passthrough = passthrough
+        self.cache = cache
+
+    @classmethod
+    def from_stacking_classifier(cls, model):
+        if any(method != "predict_proba" for method in model.stack_method_):
+            raise ValueError("Only predict_proba stacking is supported")
+        final = model.final_estimator_
+        if not hasattr(final, "coef_") or len(final.classes_) != 2:
+            raise ValueError("Only a binary linear final estimator is supported")
+        names = [name for name, _ in model.estimators]
+        return cls(zip(names, model.estimators_), final.coef_, final.intercept_[0], model.passthrough)
+
+    def with_base_models(self, base_models, cache: ProbaCache = None):
+        return StackedEnsemble(base_models, self.coef, self.intercept, self.passthrough, cache)
+
+    def meta(self):
+        return {
+            "base_models": list(self.base_models),
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept,
+            "passthrough": self.passthrough,
+        }
+
+    def base_probas(self, X, digest=None):
+        return [positive_proba(model, X, digest) for model in self.base_models.values()]
+
+    def predict_proba(self, X):
+        digest = self.cache.digest(X) if self.cache is not None else None
+        n_base = len(self.base_models)
+        margin = np.full(len(X), self.intercept)
+        if self.passthrough:
+            margin += np.asarray(X, dtype=np.float64) @ self.coef[n_base:]
+        for weight, proba in zip(self.coef, self.base_probas(X, digest)):
+            margin += weight * proba
+        return proba_columns(sigmoid(margin))
@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import json
+import os
+import time
+import uuid
+import catboost
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost
+from sklearn.model_selection import StratifiedKFold
+
+from models import CatBoostSklearn, catboost_params, meta_learner, xgboost_params
+from stacking import StackedEnsemble
+
+FIT_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "fits"
+MODEL_CLASSES = {"xgb": xgboost.XGBClassifier, "cat": CatBoostSklearn}
+THREAD_PARAMS = {"xgb": "n_jobs", "cat": "thread_count"}
+FIT_ONLY_PARAMS = {"xgb": {}, "cat": {"allow_writing_files": False}}
+LIBRARY_VERSIONS = {"xgb": xgboost.__version__, "cat": catboost.__version__}
+
+
+def frame_fingerprint(X, y):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps([[str(col) for col in X.columns], [str(dtype) for dtype in X.dtypes]]).encode())
+    hasher.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    hasher.update(np.ascontiguousarray(np.asarray(y)).tobytes())
+    return hasher.hexdigest()
+
+
+def fit_key(kind, params, data_fingerprint):
+    params = {key: value for key, value in params.items() if key != THREAD_PARAMS[kind]}
+    payload = {"kind": kind, "version": LIBRARY_VERSIONS[kind], "params": params, "data": data_fingerprint}
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+class FitCache:
+    def __init__(self, directory=FIT_CACHE_DIR, enabled: bool = True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+
+    def load(self, key):
+        path = self.directory / f"{key}.joblib"
+        if not self.enabled or not path.exists():
+            return None
+        return joblib.load(path)
+
+    def save(self, key, model):
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        joblib.dump(model, tmp_path)
+        tmp_path.replace(self.directory / f"{key}.joblib")
+
+
+def fit_model(kind, params, X, y, threads, cache: FitCache):
+    key = fit_key(kind, params, frame_fingerprint(X, y))
+    model = cache.load(key)
+    if model is not None:
+        return model, True
+    model = MODEL_CLASSES[kind](**{**params, **FIT_ONLY_PARAMS[kind], THREAD_PARAMS[kind]: threads})
+    model.fit(X, y)
+    if kind == "xgb":
+        model.set_params(n_jobs=params.get("n_jobs"))
+    cache.save(key, model)
+    return model, False
+
+
+def train_models(X_train, y_train, n_splits: int = 5, stack: bool = True, workers: int = None, cache: FitCache = None):
+    cache = cache or FitCache()
+    params = {"xgb": xgboost_params(y_train), "cat": catboost_params(y_train)}
+    folds = list(StratifiedKFold(n_splits=n_splits).split(X_train, y_train)) if stack else []
+    tasks = [(kind, None) for kind in params] + [(kind, fold) for fold in range(len(folds)) for kind in params]
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, len(tasks)))
+    threads = max(1, cpus // workers)
+
+    def run(task):
+        kind, fold = task
+        X, y = (X_train, y_train) if fold is None else (X_train.iloc[folds[fold][0]], y_train.iloc[folds[fold][0]])
+        start = time.perf_counter()
+        model, cached = fit_model(kind, params[kind], X, y, threads, cache)
+        label = "full" if fold is None else f"fold {fold + 1}/{len(folds)}"
+        print(f"Fit {kind} {label}: {'cached' if cached else f'{time.perf_counter() - start:.1f} s'}")
+        return task, model
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fitted = dict(executor.map(run, tasks))
+    print(f"Trained {len(tasks)} fits in {time.perf_counter() - start:.1f} s ({workers} workers x {threads} threads)")
+
+    models = {kind: fitted[(kind, None)] for kind in params}
+    if not stack:
+        return models, None
+
+    oof = np.zeros((len(X_train), len(params)))
+    for fold, (_, holdout) in enumerate(folds):
+        for column, kind in enumerate(params):
+            oof[holdout, column] = fitted[(kind, fold)].predict_proba(X_train.iloc[holdout])[:, 1]
+    meta = meta_learner().fit(np.hstack([oof, X_train.to_numpy()]), y_train)
+    return models, StackedEnsemble(models, meta.coef_, meta.intercept_[0], passthrough=True)
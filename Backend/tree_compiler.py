@@ -0,0 +1,171 @@
+from pathlib import Path
+import json
+import tempfile
+import numpy as np
+
+from stacking import StackedEnsemble, proba_columns, sigmoid
+
+NATIVE_MIN_ROWS = 16
+EVAL_CHUNK_ROWS = 512
+
+
+def as_float32(X):
+    return np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+
+
+def parse_base_score(value):
+    return float(str(value).strip("[]"))
+
+
+def xgboost_tables(model):
+    booster = model.get_booster()
+    config = json.loads(booster.save_raw(raw_format="json"))
+    learner = config["learner"]
+    if learner["objective"]["name"] != "binary:logistic":
+        raise ValueError(f"Unsupported XGBoost objective: {learner['objective']['name']}")
+    trees = learner["gradient_booster"]["model"]["trees"]
+    if any(tree.get("categories_nodes") for tree in trees):
+        raise ValueError("Categorical XGBoost splits are not supported")
+
+    width = max(len(tree["left_children"]) for tree in trees)
+    feature = np.zeros((len(trees), width), dtype=np.int32)
+    threshold = np.zeros((len(trees), width), dtype=np.float32)
+    left = np.zeros((len(trees), width), dtype=np.int32)
+    right = np.zeros((len(trees), width), dtype=np.int32)
+    default_left = np.zeros((len(trees), width), dtype=bool)
+    value = np.zeros((len(trees), width), dtype=np.float32)
+    depth = 0
+    for t, tree in enumerate(trees):
+        n = len(tree["left_children"])
+        lc = np.array(tree["left_children"], dtype=np.int32)
+        rc = np.array(tree["right_children"], dtype=np.int32)
+        leaf = lc == -1
+        nodes = np.arange(n, dtype=np.int32)
+        offset = t * width
+        feature[t, :n] = tree["split_indices"]
+        threshold[t, :n] = tree["split_conditions"]
+        left[t, :n] = offset + np.where(leaf, nodes, lc)
+        right[t, :n] = offset + np.where(leaf, nodes, rc)
+        default_left[t, :n] = np.array(tree["default_left"], dtype=bool)
+        value[t, :n] = np.where(leaf, np.array(tree["split_conditions"], dtype=np.float32), 0.0)
+        node_depth = np.zeros(n, dtype=np.int32)
+        for node in range(n):
+            if not leaf[node]:
+                node_depth[lc[node]] = node_depth[rc[node]] = node_depth[node] + 1
+        depth = max(depth, int(node_depth.max()))
+
+    base_score = parse_base_score(learner["learner_model_param"]["base_score"])
+    return {
+        "roots": np.arange(len(trees), dtype=np.int64) * width,
+        "feature": feature.ravel(),
+        "threshold": threshold.ravel(),
+        "left": left.ravel(),
+        "right": right.ravel(),
+        "default_left": default_left.ravel(),
+        "value": value.ravel(),
+        "depth": depth,
+        "base_margin": float(np.log(base_score / (1.0 - base_score))),
+    }
+
+
+def catboost_tables(model):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.json"
+        model.save_model(str(path), format="json")
+        config = json.loads(path.read_text())
+    if set(config["features_info"]) - {"float_features"}:
+        raise ValueError("Only float CatBoost features are supported")
+    float_features = {f["feature_index"]: f for f in config["features_info"]["float_features"]}
+    trees = config["oblivious_trees"]
+
+    depth = max(len(tree["splits"]) for tree in trees)
+    feature = np.zeros((len(trees), depth), dtype=np.int32)
+    border = np.full((len(trees), depth), np.inf, dtype=np.float32)
+    nan_as_true = np.zeros((len(trees), depth), dtype=bool)
+    leaf_values = np.zeros((len(trees), 2 ** depth), dtype=np.float64)
+    for t, tree in enumerate(trees):
+        for level, split in enumerate(tree["splits"]):
+            if split["split_type"] != "FloatFeature":
+                raise ValueError(f"Unsupported CatBoost split: {split['split_type']}")
+            info = float_features[split["float_feature_index"]]
+            feature[t, level] = info["flat_feature_index"]
+            border[t, level] = split["border"]
+            nan_as_true[t, level] = info["nan_value_treatment"] == "AsTrue"
+        leaf_values[t, :len(tree["leaf_values"])] = tree["leaf_values"]
+
+    scale, bias = config["scale_and_bias"]
+    return {
+        "feature": feature,
+        "border": border,
+        "nan_as_true": nan_as_true,
+        "leaf_values": leaf_values,
+        "weights": (1 << np.arange(depth)).astype(np.int64),
+        "scale": float(scale),
+        "bias": float(bias[0] if isinstance(bias, list) else bias),
+    }
+
+
+def xgboost_margin(tables, X):
+    margin = np.empty(len(X), dtype=np.float64)
+    rows = np.arange(min(len(X), EVAL_CHUNK_ROWS))[:, None]
+    for start in range(0, len(X), EVAL_CHUNK_ROWS):
+        chunk = X[start:start + EVAL_CHUNK_ROWS]
+        node = np.broadcast_to(tables["roots"], (len(chunk), len(tables["roots"])))
+        for _ in range(tables["depth"]):
+            values = chunk[rows[:len(chunk)], tables["feature"][node]]
+            go_left = np.where(np.isnan(values), tables["default_left"][node], values < tables["threshold"][node])
+            node = np.where(go_left, tables["left"][node], tables["right"][node])
+        margin[start:start + len(chunk)] = tables["value"][node].sum(axis=1, dtype=np.float64)
+    return margin + tables["base_margin"]
+
+
+def catboost_margin(tables, X):
+    margin = np.empty(len(X), dtype=np.float64)
+    trees = np.arange(len(tables["feature"]))[None, :]
+    for start in range(0, len(X), EVAL_CHUNK_ROWS):
+        chunk = X[start:start + EVAL_CHUNK_ROWS]
+        values = chunk[:, tables["feature"]]
+        bits = np.where(np.isnan(values), tables["nan_as_true"], values > tables["border"])
+        leaf = bits.astype(np.int64) @ tables["weights"]
+        margin[start:start + len(chunk)] = tables["leaf_values"][trees, leaf].sum(axis=1)
+    return margin * tables["scale"] + tables["bias"]
+
+
+class CompiledXGBoost:
+    def __init__(self, model, native_min_rows: int = NATIVE_MIN_ROWS):
+        self.booster = model.get_booster()
+        self.tables = xgboost_tables(model)
+        self.native_min_rows = native_min_rows
+
+    def predict_proba(self, X):
+        X = as_float32(X)
+        if len(X) >= self.native_min_rows:
+            return proba_columns(self.booster.inplace_predict(X, validate_features=False).astype(np.float64))
+        return proba_columns(sigmoid(xgboost_margin(self.tables, X)))
+
+
+class CompiledCatBoost:
+    def __init__(self, model, native_min_rows: int = NATIVE_MIN_ROWS):
+        self.model = model
+        self.tables = catboost_tables(model)
+        self.native_min_rows = native_min_rows
+
+    def predict_proba(self, X):
+        if len(X) >= self.native_min_rows:
+            raw = self.model.predict(np.asfortranarray(X, dtype=np.float32), prediction_type="RawFormulaVal")
+            return proba_columns(sigmoid(raw))
+        return proba_columns(sigmoid(catboost_margin(self.tables, as_float32(X))))
+
+
+def compile_model(model, native_min_rows: int = NATIVE_MIN_ROWS):
+    if hasattr(model, "get_booster"):
+        return CompiledXGBoost(model, native_min_rows)
+    if hasattr(model, "get_feature_importance") and hasattr(model, "save_model"):
+        return CompiledCatBoost(model, native_min_rows)
+    if isinstance(model, StackedEnsemble):
+        return model.with_base_models(
+            {name: compile_model(base, native_min_rows) for name, base in model.base_models.items()}, model.cache
+        )
+    if hasattr(model, "estimators_") and hasattr(model, "final_estimator_"):
+        return compile_model(StackedEnsemble.from_stacking_classifier(model), native_min_rows)
+    raise TypeError(f"Cannot compile {type(model).__name__}")
@@ -44,7 +44,13 @@ export const usePredict = () =>
 
 export const useExplain = () =>
   useMutation({
-    mutationFn: (payload: { model: string; row_ids: string[]; top_k: number }) =>
+    mutationFn: (payload: {
+      prediction_id: string;
+      model: string;
+      row_ids: string[];
+      top_k: number;
+      method?: "heuristic" | "shap";
+    }) =>
       apiFetch<ExplainResponse>("/api/v1/explain", {
         method: "POST",
         body: JSON.stringify(payload),
@@ -51,6 +51,7 @@ export type EdaTrainingResponse = {
 };
 
 export type PredictResponse = {
+  prediction_id: string;
   summary: {
     total: number;
     fraud_count: number;
@@ -69,6 +70,7 @@ export type PredictResponse = {
 };
 
 export type ExplainResponse = {
+  method?: "heuristic" | "shap";
   explanations: {
     row_id: string;
     proba: number;
@@ -104,7 +106,7 @@ export type UploadEdaResponse = {
     binary: number;
   };
   stats?: Record<string, { min: number; max: number; mean: number; median: number; std: number; outliers: number } | null>;
-  distributions?: Record<string, { label: string; value: number }[]>;
+  distributions?: Record<string, { label: string; value: number; error?: number }[]>;
   identity_analysis?: {
     id_columns_present: number;
     id_missing_percent: number;
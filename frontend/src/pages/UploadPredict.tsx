@@ -37,6 +37,7 @@ const UploadPredict = () => {
   };
 
   const rows = predictMutation.data?.rows || [];
+  const predictionId = predictMutation.data?.prediction_id;
 
   const columns = useMemo(
     () => [
@@ -50,8 +51,9 @@ const UploadPredict = () => {
           <Button
             variant="ghost"
             onClick={() => {
+              if (!predictionId) return;
               setSelectedRow(row.row_id);
-              explainMutation.mutate({ model, row_ids: [row.row_id], top_k: 8 });
+              explainMutation.mutate({ prediction_id: predictionId, model, row_ids: [row.row_id], top_k: 8, method: "shap" });
             }}
           >
             View reason
@@ -59,7 +61,7 @@ const UploadPredict = () => {
         ),
       },
     ],
-    [explainMutation, model]
+    [explainMutation, model, predictionId]
   );
 
   const explanation = explainMutation.data?.explanations?.find((e) => e.row_id === selectedRow);